@@ -0,0 +1,80 @@
+import argparse
+import json
+import random
+
+food_groups = ["Beverages", "Dairy", "Seafood", "Fruits", "Fungi", "Grains", "Legumes", "Meats", "Nuts", "Sweets", "Vegetables", "Herbs & Spices"]
+
+# depth: length of the recipe chains, each food uses the previous one of its chain as an ingredient
+# width: maximum number of ingredients per recipe
+# metas: number of meta variants registered under each ingredient name
+# typed: share of foods using the smelting or inheritance rules
+# keyed: share of foods also listing their saturation and food group ingredients as "modID:name:meta"
+shapes = {
+    'flat': {'depth': 1, 'width': 4, 'metas': 1, 'typed': 0.0, 'keyed': 0.0},
+    'deep': {'depth': 200, 'width': 2, 'metas': 1, 'typed': 0.0, 'keyed': 0.0},
+    'wide': {'depth': 1, 'width': 40, 'metas': 1, 'typed': 0.0, 'keyed': 0.0},
+    'meta': {'depth': 1, 'width': 4, 'metas': 16, 'typed': 0.0, 'keyed': 0.0},
+    'typed': {'depth': 4, 'width': 4, 'metas': 1, 'typed': 0.8, 'keyed': 0.0},
+    'mixed': {'depth': 20, 'width': 12, 'metas': 4, 'typed': 0.3, 'keyed': 0.0},
+    'keyed': {'depth': 4, 'width': 40, 'metas': 8, 'typed': 0.0, 'keyed': 0.8},
+}
+
+
+def generate_pack(size, shape='mixed', seed=0):
+    # Builds a Raw_FoodValues.json with [size] entries, every ingredient of which can be resolved
+    settings = shapes[shape]
+    rng = random.Random(seed)
+
+    ingredients = []
+    ingredient_names = []
+    ingredient_metas = {}
+    while len(ingredients) < max(size // 4, 1):
+        name = f'benchmark:ingredient{len(ingredient_names)}'
+        ingredient_names.append(name)
+        groups = rng.sample(food_groups, rng.randint(0, 2)) or ['None']
+
+        for meta in range(min(settings['metas'], max(size // 4, 1) - len(ingredients))):
+            entry = {'name': name, 'meta': meta, 'hunger': rng.randint(0, 4), 'foodGroups': groups}
+            if rng.random() < 0.3:
+                entry['saturationModifier'] = rng.choice([0.1, 0.4, 0.8, 1])
+            ingredients.append(entry)
+            ingredient_metas[name] = meta + 1
+
+    foods = []
+    for position in range(size - len(ingredients)):
+        recipe = rng.sample(ingredient_names, min(rng.randint(1, settings['width']), len(ingredient_names)))
+        if position % settings['depth']:
+            recipe.append(foods[-1]['name'])
+
+        entry = {'name': f'benchmark:food{position}', 'meta': 0, 'hunger': recipe}
+        if settings['keyed'] and rng.random() < settings['keyed']:
+            keys = [f'{name}:{rng.randrange(ingredient_metas.get(name, 1))}' for name in recipe]
+            entry['saturationModifier'] = keys
+            entry['foodGroups'] = list(keys)
+        if rng.random() < settings['typed']:
+            entry['type'] = rng.choice(['smelting', 'inheritance'])
+        if rng.random() < 0.1:
+            entry['hungerModifier'] = 0.5
+        if rng.random() < 0.05:
+            entry['appendGroups'] = rng.sample(food_groups, 1)
+        if rng.random() < 0.05:
+            entry['removeGroups'] = rng.sample(food_groups, 1)
+        foods.append(entry)
+
+    return {'foods': foods, 'ingredients': ingredients}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Writes a synthetic Raw_FoodValues.json.')
+    parser.add_argument('size', type=int, help='number of entries')
+    parser.add_argument('--shape', default='mixed', choices=list(shapes), help='recipe shape (default: mixed)')
+    parser.add_argument('--seed', type=int, default=0, help='random seed (default: 0)')
+    parser.add_argument('--output', default='Raw_FoodValues.json', help='file to write (default: Raw_FoodValues.json)')
+    arguments = parser.parse_args(argv)
+
+    with open(arguments.output, 'w') as output:
+        json.dump(generate_pack(arguments.size, arguments.shape, arguments.seed), output, indent=4)
+
+
+if __name__ == '__main__':
+    main()
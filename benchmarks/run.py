@@ -0,0 +1,134 @@
+import argparse
+import itertools
+import json
+import platform
+import sys
+import tempfile
+import tracemalloc
+
+from foodparser import Config, FoodParser
+from foodparser.logs import setup_logging
+from foodparser.output import Serializer, export_food_groups, output_food_values
+from foodparser.report import RunReport
+
+from .generate import generate_pack, shapes
+
+default_sizes = [1000, 10000, 50000]
+
+
+def run_pack(json_data, config, output_root, batch=False, serializer=None):
+    # Same steps as a run of the command line, without reading the pack from a file
+    report = RunReport()
+    result = FoodParser(config, batch).parse(json_data, report=report)
+
+    with report.stage('export'):
+        export_food_groups(result.groups, output_root, report, serializer=serializer)
+
+    with report.stage('output'):
+        output_food_values(result.groups, output_root, report, serializer)
+
+    return report.get_report()
+
+
+def run_case(size, shape, seed, repeat, memory, engine='python', serializer='json'):
+    json_data = generate_pack(size, shape, seed)
+    config = Config()
+    batch = engine == 'numpy'
+    case = {'shape': shape, 'size': size, 'seed': seed, 'engine': engine, 'serializer': serializer}
+    serializer = Serializer(serializer)
+
+    with tempfile.TemporaryDirectory() as output_root:
+        # Best of [repeat] runs for every stage, a fresh output folder each time so every file gets written
+        runs = []
+        for run in range(repeat):
+            with tempfile.TemporaryDirectory(dir=output_root) as run_root:
+                runs.append(run_pack(json_data, config, run_root, batch, serializer))
+
+        case['seconds'] = {stage: min(report['stages'][stage]['seconds'] for report in runs) for stage in runs[0]['stages']}
+        case['seconds']['total'] = min(report['seconds'] for report in runs)
+        case['counters'] = runs[0]['counters']
+
+        # Tracing slows every allocation down, so memory is measured on a run of its own
+        if memory:
+            tracemalloc.start()
+            try:
+                with tempfile.TemporaryDirectory(dir=output_root) as run_root:
+                    report = run_pack(json_data, config, run_root, batch, serializer)
+            finally:
+                tracemalloc.stop()
+
+            case['peak_memory'] = report['peak_memory']
+            case['stage_peak_memory'] = {stage: values['peak_memory'] for stage, values in report['stages'].items()}
+
+    return case
+
+
+def find_regressions(results, baseline, tolerance):
+    previous = {(case['shape'], case['size'], case['seed'], case.get('engine', 'python'), case.get('serializer', 'json')): case
+                for case in baseline['cases']}
+    regressions = []
+
+    for case in results['cases']:
+        before = previous.get((case['shape'], case['size'], case['seed'], case['engine'], case['serializer']))
+        if before is None:
+            continue
+
+        for stage, seconds in case['seconds'].items():
+            if stage in before['seconds'] and seconds > before['seconds'][stage] * (1 + tolerance):
+                regressions.append(f'{case["shape"]}/{case["size"]}/{case["engine"]}/{case["serializer"]} {stage}: {before["seconds"][stage]:.3f}s -> {seconds:.3f}s')
+
+        if 'peak_memory' in case and 'peak_memory' in before and case['peak_memory'] > before['peak_memory'] * (1 + tolerance):
+            regressions.append(f'{case["shape"]}/{case["size"]}/{case["engine"]}/{case["serializer"]} peak memory: {before["peak_memory"]} -> {case["peak_memory"]} bytes')
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Times every stage of the parser on synthetic packs.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=default_sizes,
+                        help=f'number of entries of each pack (default: {" ".join(map(str, default_sizes))})')
+    parser.add_argument('--shapes', nargs='+', default=list(shapes), choices=list(shapes), help='recipe shapes (default: all)')
+    parser.add_argument('--engines', nargs='+', default=['python'], choices=['python', 'numpy'],
+                        help='engines computing hunger and saturation values, numpy being FoodParser(batch=True) (default: python)')
+    parser.add_argument('--serializers', nargs='+', default=['json'], choices=['json', 'orjson'],
+                        help='encoders of the output files (default: json)')
+    parser.add_argument('--seed', type=int, default=0, help='random seed of the generated packs (default: 0)')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per pack, the fastest one is kept (default: 3)')
+    parser.add_argument('--no-memory', action='store_true', help='skip the extra run measuring peak memory')
+    parser.add_argument('--output', help='file the JSON results are written to, printed when omitted')
+    parser.add_argument('--baseline', help='JSON results of an earlier run to compare with, exits with 1 on regressions')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='slowdown allowed before a stage counts as a regression (default: 0.2, i.e. 20%%)')
+    parser.add_argument('--log-level', default='OFF', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR', 'OFF'],
+                        help='log level of the parser (default: OFF)')
+    parser.add_argument('--log-file', default='benchmark.log', help='log file (default: benchmark.log)')
+    arguments = parser.parse_args(argv)
+
+    setup_logging(arguments.log_level, arguments.log_file)
+
+    results = {'python': platform.python_version(), 'platform': platform.platform(), 'cases': []}
+    for shape in arguments.shapes:
+        for size in arguments.sizes:
+            for engine, serializer in itertools.product(arguments.engines, arguments.serializers):
+                case = run_case(size, shape, arguments.seed, arguments.repeat, not arguments.no_memory, engine, serializer)
+                results['cases'].append(case)
+                print(f'{shape:>6} {size:>7} {engine:>6} {serializer:>6}: '
+                      + ', '.join(f'{stage} {seconds:.3f}s' for stage, seconds in case['seconds'].items()), file=sys.stderr)
+
+    if arguments.output:
+        with open(arguments.output, 'w') as output:
+            json.dump(results, output, indent=4)
+    else:
+        print(json.dumps(results, indent=4))
+
+    if arguments.baseline:
+        with open(arguments.baseline, 'r') as baseline_input:
+            regressions = find_regressions(results, json.load(baseline_input), arguments.tolerance)
+        for regression in regressions:
+            print(f'Regression: {regression}', file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
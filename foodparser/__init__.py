@@ -0,0 +1,4 @@
+from .config import Config
+from .parser import FoodParser, ParseResult
+
+__all__ = ['Config', 'FoodParser', 'ParseResult']
@@ -0,0 +1,220 @@
+import argparse
+import cProfile
+import json
+import os
+import time
+import tracemalloc
+
+from timeit import default_timer as timer
+
+from .cache import ValueCache, default_size
+from .config import Config, load_config
+from .entry import Entry, read_entries
+from .incremental import load_state, save_state
+from .logs import log_file, log_level, setup_logging
+from .output import Serializer, export_food_groups, output_food_values
+from .parser import FoodParser
+from .report import RunReport
+from .snapshot import output_snapshot
+from .statistics import get_quality_labels
+from .stream import load_stream
+
+
+def get_argument_parser():
+    parser = argparse.ArgumentParser(description='Allocates food values and food groups based on their recipes.')
+    parser.add_argument('--input', default='Raw_FoodValues.json', help='raw food values (default: Raw_FoodValues.json)')
+    parser.add_argument('--output', default='./output', help='output folder (default: ./output)')
+    parser.add_argument('--config', help='JSON file of the settings to change, e.g. {"base_saturation": 0.3}, see config.Config')
+    parser.add_argument('--stream', action='store_true',
+                        help='read the input one entry at a time, for files too large to be loaded at once')
+    parser.add_argument('--batch', action='store_true', help='compute hunger and saturation values with NumPy, same results')
+    parser.add_argument('--compact', action='store_true', help='write the SpiceOfLife group files without indentation')
+    parser.add_argument('--serializer', default='auto', choices=['auto', 'json', 'orjson'],
+                        help='JSON encoder of the output files, orjson is faster but indents by 2 spaces (default: auto, '
+                             'orjson when installed)')
+    parser.add_argument('--gzip-debug', action='store_true', help='write the debug dump compressed, as DEBUG-Food Values.json.gz')
+    parser.add_argument('--snapshot', action='store_true',
+                        help='also write Food Values.bin, a binary copy for fast lookups, see python -m foodparser.snapshot')
+    parser.add_argument('--watch', action='store_true',
+                        help='keep running and resolve the input again every time it or the config file is saved')
+    parser.add_argument('--poll-interval', type=float, default=0.2, help='seconds between two checks for changes with --watch')
+    parser.add_argument('--incremental', action='store_true',
+                        help='reuse the values saved by the previous incremental run for entries that did not change')
+    parser.add_argument('--cache', help='SQLite file of resolved entries shared by every pack, see python -m foodparser.cachetool')
+    parser.add_argument('--cache-size', type=int, default=default_size,
+                        help=f'maximum number of entries kept in the cache (default: {default_size})')
+    parser.add_argument('--log-level', default=log_level, choices=['DEBUG', 'INFO', 'WARNING', 'ERROR', 'OFF'],
+                        help=f'minimum level written to the log, INFO leaves out the per-entry messages (default: {log_level})')
+    parser.add_argument('--log-file', default=log_file, help=f'log file, overwritten on every run (default: {log_file})')
+    parser.add_argument('--log-queue', action='store_true', help='write the log from a background thread')
+    parser.add_argument('--report', help='file a JSON report of the time and counters of every stage is written to')
+    parser.add_argument('--statistics', help='file the statistics of the resolved foods are written to as JSON')
+    parser.add_argument('--profile', help='file the cProfile statistics of the run are written to, see the pstats module')
+    parser.add_argument('--trace-memory', action='store_true', help='add the peak memory of every stage to the report')
+    return parser
+
+
+def run(arguments, config=None, state=None, json_data=None):
+    # One complete run with the parsed command line [arguments], returns the ParseResult.
+    # [state] is the incremental state of an earlier run, read from the output folder when not given.
+    # [json_data] is the input when it is already loaded. Logging is left to the caller, see setup_logging()
+    if arguments.trace_memory:
+        tracemalloc.start()
+    profiler = cProfile.Profile() if arguments.profile else None
+    if profiler is not None:
+        profiler.enable()
+
+    report = RunReport()
+    with report.stage('load'):
+        if json_data is not None:
+            groups = read_entries(json_data)
+        else:
+            with open(arguments.input, 'r') as f:
+                groups = load_stream(f, read_entry=Entry) if arguments.stream else read_entries(json.load(f))
+
+    if config is None:
+        config = load_config(arguments.config) if arguments.config else Config()
+    if state is None and arguments.incremental:
+        state = load_state(arguments.output, config)
+    incremental = arguments.incremental or arguments.watch
+    cache = ValueCache(arguments.cache, arguments.cache_size) if arguments.cache else None
+    try:
+        result = FoodParser(config, arguments.batch, cache).resolve(groups, incremental, state, report)
+    finally:
+        if cache is not None:
+            cache.close()
+
+    write_results(arguments, result, report)
+
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(arguments.profile)
+    if arguments.report:
+        with open(arguments.report, 'w') as report_output:
+            report_output.write(report.to_json())
+    if arguments.trace_memory:
+        tracemalloc.stop()
+
+    return result
+
+
+def update(arguments, previous, json_data):
+    # Resolves [json_data] again from [previous], the (json_data, ParseResult) of the last run of a watch with the same
+    # config, and writes the output files. None when the entries cannot be matched, see FoodParser.update()
+    report = RunReport()
+    cache = ValueCache(arguments.cache, arguments.cache_size) if arguments.cache else None
+    try:
+        result = FoodParser(previous[1].config, arguments.batch, cache).update(previous[1], previous[0], json_data, report)
+    finally:
+        if cache is not None:
+            cache.close()
+    if result is None:
+        return None
+
+    write_results(arguments, result, report)
+    if arguments.report:
+        with open(arguments.report, 'w') as report_output:
+            report_output.write(report.to_json())
+
+    return result
+
+
+def write_results(arguments, result, report):
+    serializer = Serializer(arguments.serializer)
+    with report.stage('export'):
+        export_food_groups(result.groups, arguments.output, report, arguments.compact, serializer)
+
+    with report.stage('output'):
+        output_food_values(result.groups, arguments.output, report, serializer, arguments.gzip_debug)
+        if arguments.snapshot:
+            output_snapshot(result.groups, arguments.output, report)
+        if arguments.incremental:
+            save_state(arguments.output, result.graph, result.config, report)
+
+
+def get_modified_times(filenames):
+    times = []
+    for filename in filenames:
+        try:
+            times.append(os.stat(filename).st_mtime_ns)
+        except OSError:
+            times.append(None)
+    return times
+
+
+def watch(arguments):
+    # Resolves the input every time it is saved. The input, entries and graph of the last run stay in memory, so only
+    # the entries that changed and those depending on them are resolved again, and only the output files that changed
+    # are rewritten. Streamed inputs are not kept, only the values of the last run are reused for them
+    watched = [arguments.input] + ([arguments.config] if arguments.config else [])
+    modified = None
+    # (json_data, ParseResult) of the last run
+    previous = None
+    state = None
+    print(f'Watching {", ".join(watched)}, press Ctrl+C to stop.')
+
+    try:
+        while True:
+            if get_modified_times(watched) != modified:
+                modified = get_modified_times(watched)
+                start = timer()
+                try:
+                    config = load_config(arguments.config) if arguments.config else Config()
+                    # Results of the previous run only apply as long as the config is the same
+                    if previous is not None and previous[1].config.get_hash() != config.get_hash():
+                        previous = None
+                    if state is not None and state['config'] != config.get_hash():
+                        state = None
+
+                    if arguments.stream:
+                        result = run(arguments, config, state)
+                        state = result.get_state()
+                    else:
+                        with open(arguments.input, 'r') as f:
+                            json_data = json.load(f)
+                        # Updating reuses the entries of the last run, which are left out of date
+                        last, previous = previous, None
+                        result = update(arguments, last, json_data) if last is not None else None
+                        if result is None:
+                            result = run(arguments, config, last[1].get_state() if last is not None else None, json_data)
+                        previous = (json_data, result)
+                except (OSError, ValueError, KeyError, TypeError) as e:
+                    # Also reached while the file is only partly saved or holds an entry that cannot be read, the next
+                    # save is picked up as usual
+                    print(f'Could not resolve {arguments.input}: {e if isinstance(e, (OSError, ValueError)) else repr(e)}')
+                else:
+                    entries = len(result.graph['entries'])
+                    print(f'Resolved {entries - len(result.graph["restored"])} of {entries} entries '
+                          f'and wrote {result.report.counters["files_written"]} files in {round(timer() - start, 3)} seconds')
+
+            time.sleep(arguments.poll_interval)
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv=None):
+    start = timer()
+
+    arguments = get_argument_parser().parse_args(argv)
+    # Once for the whole session, a watch keeps appending to the same log
+    setup_logging(arguments.log_level, arguments.log_file, arguments.log_queue)
+    if arguments.watch:
+        watch(arguments)
+        return
+
+    result = run(arguments)
+    statistics = result.get_statistics()
+    if arguments.statistics:
+        with open(arguments.statistics, 'w') as statistics_output:
+            json.dump(statistics, statistics_output, indent=4)
+
+    end = timer()
+
+    print('Completed!')
+    print('Processed ' + str(statistics['entries']) + ' food entries in ' + str(round(end - start, 3)) + ' seconds')
+    print(f'Total food points: {statistics["total_food_points"]}')
+    for label, count in zip(get_quality_labels(statistics['quality_thresholds']), statistics['qualities']):
+        print(f'{label}: {count}')
+
+if __name__ == '__main__':
+    main()
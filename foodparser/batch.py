@@ -0,0 +1,286 @@
+import logging
+
+from .entry import missing
+from .graph import topological_order
+from .hunger import process_hunger_entries
+from .items import is_conversion_complete
+from .saturation import process_saturation_entries
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+logger = logging.getLogger('FoodParser')
+
+# Stands for a candidate which is not resolved yet, larger than any conversion cycle
+unresolved_cycle = 1 << 62
+
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def get_levels(graph, category, order):
+    # Dependency depth of every entry, each entry only depends on entries of lower levels
+    dependencies = graph[category]
+    depth = {}
+    for index in order:
+        depth[index] = 1 + max((depth[target] for ingredient, targets in dependencies[index] for target in targets), default=-1)
+
+    levels = []
+    for index in order:
+        if depth[index] == len(levels):
+            levels.append([])
+        levels[depth[index]].append(index)
+
+    # Levels are processed in turn, entries of a level in file order
+    return [sorted(level) for level in levels]
+
+
+def get_pending_saturation_entries(graph, config, order):
+    # Entries with a list to convert, or None when one of them could not be resolved. In that case an entry would
+    # fall back on another ingredient match depending on processing order, which only the pure-Python path reproduces
+    entries = graph['entries']
+    fallbacks = graph['fallbacks']['saturationModifier']
+    pending = []
+    resolved = set()
+
+    for index in order:
+        entry = entries[index]
+        if entry.saturation_resolved or (index not in graph['restored'] and isinstance(entry.saturation, int)):
+            resolved.add(index)
+            continue
+        if index in graph['restored']:
+            continue
+        if not isinstance(entry.saturation, list) or not entry.saturation:
+            return None
+
+        # Dependencies come first in [order], so each target is known to resolve or not by now
+        sources = iter(graph['saturationModifier'][index])
+        for element in entry.saturation:
+            if isinstance(element, float):
+                continue
+            if not isinstance(element, str):
+                return None
+            if element in fallbacks.get(index, ()):
+                if not is_number(config.unresolved_ingredient['saturationModifier']):
+                    return None
+            else:
+                targets = next(sources)[1]
+                if not targets or targets[0] not in resolved:
+                    return None
+
+        pending.append(index)
+        resolved.add(index)
+
+    return pending
+
+
+def process_saturation_entries_batch(graph, config):
+    # Same results as saturation.process_saturation_entries(), computed one dependency level at a time over NumPy arrays
+    entries = graph['entries']
+    order = topological_order(graph, 'saturationModifier')
+
+    pending = get_pending_saturation_entries(graph, config, order)
+    if pending is None or len(order) < len(entries):
+        logger.info('Saturation values cannot be batched, using the pure-Python path.')
+        return process_saturation_entries(graph, config)
+
+    for index in order:
+        entry = entries[index]
+        # Found manually compiled numerical entry without decimal. We'll use that
+        if index not in graph['restored'] and not entry.saturation_resolved and isinstance(entry.saturation, int):
+            entry.saturation = float(entry.saturation)
+            entry.saturation_resolved = True
+
+    values = numpy.array([entry.saturation if entry.saturation_resolved else numpy.nan for entry in entries], dtype=numpy.float64)
+    fallbacks = graph['fallbacks']['saturationModifier']
+    pending_entries = set(pending)
+
+    for level in get_levels(graph, 'saturationModifier', order):
+        level = [index for index in level if index in pending_entries]
+        if not level:
+            continue
+
+        # One component per element of every list of the level, either another entry or a constant
+        owners = []
+        component_targets = []
+        constants = []
+        for position, index in enumerate(level):
+            entry = entries[index]
+            sources = iter(graph['saturationModifier'][index])
+            for element in entry.saturation:
+                owners.append(position)
+                if isinstance(element, float):
+                    component_targets.append(-1)
+                    constants.append(element)
+                elif element in fallbacks.get(index, ()):
+                    component_targets.append(-1)
+                    constants.append(float(config.unresolved_ingredient['saturationModifier']))
+                else:
+                    component_targets.append(next(sources)[1][0])
+                    constants.append(0.0)
+
+        owners = numpy.array(owners, dtype=numpy.intp)
+        component_targets = numpy.array(component_targets, dtype=numpy.intp)
+        components = numpy.where(component_targets >= 0,
+                                 numpy.maximum(values[component_targets], config.base_saturation),
+                                 numpy.array(constants, dtype=numpy.float64))
+
+        # Top Saturation Score in list, then minimum saturation and saturation bonuses
+        top_scores = numpy.full(len(level), -numpy.inf)
+        numpy.maximum.at(top_scores, owners, components)
+        final_scores = numpy.maximum(top_scores, config.base_saturation)
+
+        incompatible = numpy.array([entries[index].type in config.incompatible_with_saturation_bonus for index in level])
+        bonuses = numpy.where(incompatible, 0, numpy.where(final_scores < config.low_saturation_threshold,
+                                                           config.low_saturation_bonus, config.bonus_saturation))
+
+        # Python's round() is correctly rounded, numpy.round() is not, so the last step stays in Python
+        scores = [float(round(score, 1)) for score in (final_scores + bonuses).tolist()]
+        components = components.tolist()
+
+        start = 0
+        for position, index in enumerate(level):
+            entry = entries[index]
+            end = start + len(entry.saturation)
+            entry.component_saturations = components[start:end]
+            entry.saturation = scores[position]
+            entry.saturation_resolved = True
+            values[index] = scores[position]
+            start = end
+
+    logger.info('Processed %d saturation entries.', len(pending))
+
+    if is_conversion_complete(entries, 'saturationModifier'):
+        logger.info('Success!')
+    else:
+        logger.info('Saturation conversion incomplete.')
+
+    return len(pending)
+
+
+def get_pending_hunger_entries(graph, config, order):
+    # Entries with a list to sum, or None when one of them could not be resolved
+    entries = graph['entries']
+    conversion_cycles = graph['conversion_cycles']
+    fallbacks = graph['fallbacks']['hunger']
+
+    pending = [index for index in order if index not in graph['restored']
+               and not entries[index].hunger_resolved and isinstance(entries[index].hunger, list)]
+    resolved = set(pending) | set(conversion_cycles) | {
+        index for index in order if index not in graph['restored'] and entries[index].hunger_resolved}
+
+    for index in pending:
+        entry = entries[index]
+        if entry.hunger_modifier is not missing and not is_number(entry.hunger_modifier):
+            return None
+
+        targets = {ingredient: targets for ingredient, targets in graph['hunger'][index]}
+        for element in entry.hunger:
+            if isinstance(element, int):
+                continue
+            if not isinstance(element, str):
+                return None
+            if element in fallbacks.get(index, ()):
+                if not is_number(config.unresolved_ingredient['hunger']):
+                    return None
+            elif not any(target in resolved for target in targets.get(element, ())):
+                return None
+
+    if not is_number(config.bonus_smelting):
+        return None
+
+    return pending
+
+
+def process_hunger_entries_batch(graph, config):
+    # Same results as hunger.process_hunger_entries(), computed one dependency level at a time over NumPy arrays
+    entries = graph['entries']
+    conversion_cycles = graph['conversion_cycles']
+    order = topological_order(graph, 'hunger')
+
+    pending = get_pending_hunger_entries(graph, config, order)
+    if pending is None or len(order) < len(entries):
+        logger.info('Hunger values cannot be batched, using the pure-Python path.')
+        return process_hunger_entries(graph, config)
+
+    for index in order:
+        if index not in graph['restored'] and entries[index].hunger_resolved:
+            conversion_cycles[index] = -1
+
+    values = numpy.zeros(len(entries), dtype=numpy.float64)
+    cycles = numpy.full(len(entries), unresolved_cycle, dtype=numpy.int64)
+    for index, cycle in conversion_cycles.items():
+        values[index] = entries[index].hunger
+        cycles[index] = cycle
+
+    fallbacks = graph['fallbacks']['hunger']
+    pending_entries = set(pending)
+
+    for level in get_levels(graph, 'hunger', order):
+        level = [index for index in level if index in pending_entries]
+        if not level:
+            continue
+
+        # Constant parts of every sum, and one edge per ingredient looked up by name
+        constants = numpy.zeros(len(level), dtype=numpy.float64)
+        edge_owners = []
+        candidate_edges = []
+        candidates = []
+        for position, index in enumerate(level):
+            entry = entries[index]
+            targets = {ingredient: targets for ingredient, targets in graph['hunger'][index]}
+            for element in entry.hunger:
+                if isinstance(element, int):
+                    constants[position] += element
+                elif element in fallbacks.get(index, ()):
+                    constants[position] += config.unresolved_ingredient['hunger']
+                else:
+                    candidate_edges.extend([len(edge_owners)] * len(targets[element]))
+                    candidates.extend(targets[element])
+                    edge_owners.append(position)
+
+        edge_owners = numpy.array(edge_owners, dtype=numpy.intp)
+        candidate_edges = numpy.array(candidate_edges, dtype=numpy.intp)
+        candidates = numpy.array(candidates, dtype=numpy.intp)
+        level_indexes = numpy.array(level, dtype=numpy.intp)
+
+        # The fixed-point loop took the first candidate numerical on the earliest cycle any of them was,
+        # candidates behind the entry only counting from the cycle after their conversion. See hunger.get_hunger_value()
+        ready = cycles[candidates] + (candidates > level_indexes[edge_owners[candidate_edges]])
+        ready[cycles[candidates] == unresolved_cycle] = unresolved_cycle
+        edge_cycles = numpy.full(len(edge_owners), unresolved_cycle, dtype=numpy.int64)
+        numpy.minimum.at(edge_cycles, candidate_edges, ready)
+        edge_cycles = numpy.maximum(edge_cycles, 0)
+
+        first = numpy.full(len(edge_owners), len(candidates), dtype=numpy.intp)
+        eligible = ready <= edge_cycles[candidate_edges]
+        numpy.minimum.at(first, candidate_edges[eligible], numpy.flatnonzero(eligible))
+
+        sums = constants + numpy.bincount(edge_owners, weights=values[candidates[first]], minlength=len(level))
+        entry_cycles = numpy.zeros(len(level), dtype=numpy.int64)
+        numpy.maximum.at(entry_cycles, edge_owners, edge_cycles + 1)
+
+        # Sum hunger entries, entries with a value of exactly 0 remain 0, else they get a minimum of 1
+        sums += numpy.array([config.bonus_smelting if entries[index].type == 'smelting' else 0 for index in level], dtype=numpy.float64)
+        modifiers = numpy.array([1 if entries[index].hunger_modifier is missing else entries[index].hunger_modifier for index in level],
+                                dtype=numpy.float64)
+        hunger = numpy.where(sums == 0, 0, numpy.maximum(numpy.trunc(sums * modifiers), 1)).astype(numpy.int64)
+
+        values[level_indexes] = hunger
+        cycles[level_indexes] = entry_cycles
+        for index, value, cycle in zip(level, hunger.tolist(), entry_cycles.tolist()):
+            entries[index].hunger = value
+            entries[index].hunger_resolved = True
+            conversion_cycles[index] = cycle
+
+    logger.info('Processed %d hunger entries.', len(pending))
+
+    if is_conversion_complete(entries, 'hunger'):
+        logger.info('Success!')
+    else:
+        logger.info('Hunger conversion incomplete.')
+
+    return len(pending)
@@ -0,0 +1,157 @@
+import bisect
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+
+from .graph import categories, topological_order
+from .incremental import hash_entry
+
+logger = logging.getLogger('FoodParser')
+
+# Part of every key, changing how values are resolved or how keys are computed must increase it
+cache_version = 3
+default_size = 1000000
+
+
+class ValueCache:
+    # Resolved entries shared by every pack using the same SQLite file, keyed by get_cache_keys().
+    # Holds at most [size] entries, the least recently used ones being evicted first
+
+    def __init__(self, filename, size=default_size):
+        self.size = size
+        # Several packs may be resolved at once against the same file
+        self.connection = sqlite3.connect(filename, timeout=60)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, name TEXT, value TEXT, used REAL)')
+        self.connection.execute('CREATE INDEX IF NOT EXISTS entries_used ON entries (used)')
+        self.connection.execute('CREATE INDEX IF NOT EXISTS entries_name ON entries (name)')
+        self.connection.commit()
+
+    def get_many(self, keys, chunk_size=500):
+        found = {}
+        keys = list(keys)
+        for start in range(0, len(keys), chunk_size):
+            chunk = keys[start:start + chunk_size]
+            query = f'SELECT key, value FROM entries WHERE key IN ({",".join("?" * len(chunk))})'
+            found.update(self.connection.execute(query, chunk))
+
+        # Marks the entries found as recently used
+        now = time.time()
+        found_keys = list(found)
+        with self.connection:
+            for start in range(0, len(found_keys), chunk_size):
+                chunk = found_keys[start:start + chunk_size]
+                self.connection.execute(f'UPDATE entries SET used = ? WHERE key IN ({",".join("?" * len(chunk))})', [now, *chunk])
+        return {key: json.loads(value) for key, value in found.items()}
+
+    def put_many(self, items):
+        # [items] are (key, name, value) tuples
+        now = time.time()
+        with self.connection:
+            self.connection.executemany('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)',
+                                        [(key, name, json.dumps(value), now) for key, name, value in items])
+        self.evict()
+
+    def evict(self):
+        excess = len(self) - self.size
+        if excess > 0:
+            with self.connection:
+                self.connection.execute('DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY used LIMIT ?)', (excess,))
+        return max(excess, 0)
+
+    def invalidate(self, names):
+        # Drops the entries named one of [names], e.g. "minecraft:apple", names ending with ":" standing for every entry
+        # of that mod, e.g. "minecraft:"
+        dropped = 0
+        with self.connection:
+            for name in names:
+                if name.endswith(':'):
+                    # LIKE ignores the case of ASCII letters, the prefix is compared again as it is
+                    cursor = self.connection.execute("DELETE FROM entries WHERE name LIKE ? ESCAPE '\\' AND substr(name, 1, ?) = ?",
+                                                     (escape_like(name) + '%', len(name), name))
+                else:
+                    cursor = self.connection.execute('DELETE FROM entries WHERE name = ?', (name,))
+                dropped += cursor.rowcount
+        return dropped
+
+    def clear(self):
+        with self.connection:
+            return self.connection.execute('DELETE FROM entries').rowcount
+
+    def close(self):
+        self.connection.close()
+
+    def __len__(self):
+        return self.connection.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+
+def escape_like(text):
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def get_cache_keys(graph, config):
+    # An entry resolves to the same values whenever its own fields, the config and every entry it depends on are the same.
+    # Each category has its own subtree hash: the entry, its stand-in ingredients and the subtree hashes of its targets.
+    # Hunger values also depend on whether a candidate comes before or after the entry, see hunger.get_hunger_value()
+    entries = graph['entries']
+    # Incremental runs have hashed the entries before restoring any of them, others have not restored anything yet.
+    # Both hash the fields in their order, so that an entry is never restored with the field order of another pack
+    own = [bytes.fromhex(entry_hash) for entry_hash in graph.get('hashes') or map(hash_entry, entries)]
+    prefix = f'{cache_version}:{config.get_hash()}'.encode()
+    keys = [hashlib.sha1(prefix) for _ in entries]
+
+    for category in categories:
+        fallbacks = graph['fallbacks'][category]
+        hashes = [b''] * len(entries)
+        # Ingredients and their targets' hashes, for each edge shared by the entries
+        edge_parts = {}
+        for index in topological_order(graph, category):
+            parts = [own[index]]
+            parts.extend(b'?' + ingredient.encode() + b'\0' for ingredient in sorted(fallbacks.get(index, ())))
+            for edge in graph[category][index]:
+                part = edge_parts.get(id(edge))
+                if part is None:
+                    ingredient, targets = edge
+                    part = edge_parts[id(edge)] = b''.join([ingredient.encode(), b'\0', len(targets).to_bytes(4, 'little'),
+                                                            *(hashes[target] for target in targets)])
+                parts.append(part)
+                if category == 'hunger':
+                    # Targets are in file order, the number of them before the entry tells which ones come after it
+                    parts.append(bisect.bisect(edge[1], index).to_bytes(4, 'little'))
+            if category == 'foodGroups':
+                # Targets only merged with the groups written for them, see graph.prune_group_candidates()
+                parts.extend(b'~' + hashes[target] for target in sorted(graph['written_only'].get(index, ())))
+            hashes[index] = hashlib.sha1(b''.join(parts)).digest()
+
+        for key, subtree in zip(keys, hashes):
+            key.update(subtree)
+
+    return [key.hexdigest() for key in keys]
+
+
+def restore_cached_entries(graph, cache, config):
+    # Entries found in [cache] are restored and skipped by the stages, like unchanged entries in incremental runs
+    graph['cache_keys'] = get_cache_keys(graph, config)
+    cached = cache.get_many(key for index, key in enumerate(graph['cache_keys']) if index not in graph['restored'])
+
+    graph['cached'] = set()
+    for index, (key, entry) in enumerate(zip(graph['cache_keys'], graph['entries'])):
+        if key in cached and index not in graph['restored']:
+            entry.update(cached[key]['resolved'])
+            if cached[key]['conversionCycle'] is not None:
+                graph['conversion_cycles'][index] = cached[key]['conversionCycle']
+            graph['restored'].add(index)
+            graph['cached'].add(index)
+
+    logger.info('Found %d of %d entries in the cache.', len(graph['cached']), len(graph['entries']))
+    return len(graph['cached'])
+
+
+def store_resolved_entries(graph, cache):
+    # Adds the entries resolved by this run
+    cache.put_many((key, entry.name, {'resolved': entry.to_dict(), 'conversionCycle': graph['conversion_cycles'].get(index)})
+                   for index, (key, entry) in enumerate(zip(graph['cache_keys'], graph['entries']))
+                   if index not in graph['cached'])
+    return len(graph['entries']) - len(graph['cached'])
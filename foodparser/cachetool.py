@@ -0,0 +1,30 @@
+import argparse
+import sys
+
+from .cache import ValueCache, default_size
+
+# Maintenance of the file given to --cache, e.g. python -m foodparser.cachetool cache.db --invalidate "minecraft:"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Manages the cache of resolved entries used with --cache.')
+    parser.add_argument('cache', help='cache file')
+    parser.add_argument('--size', type=int, help='evict the least recently used entries down to this number of entries')
+    parser.add_argument('--invalidate', nargs='+', metavar='NAME',
+                        help='drop the entries with these names, names ending with ":" dropping a whole mod, e.g. "minecraft:"')
+    parser.add_argument('--clear', action='store_true', help='drop every entry')
+    arguments = parser.parse_args(argv)
+
+    cache = ValueCache(arguments.cache, arguments.size if arguments.size is not None else default_size)
+    if arguments.clear:
+        print(f'Dropped {cache.clear()} entries')
+    if arguments.invalidate:
+        print(f'Dropped {cache.invalidate(arguments.invalidate)} entries')
+    if arguments.size is not None:
+        print(f'Evicted {cache.evict()} entries')
+    print(f'{len(cache)} entries in {arguments.cache}')
+    cache.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
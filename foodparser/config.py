@@ -0,0 +1,73 @@
+import hashlib
+import json
+from dataclasses import asdict, dataclass, field, fields
+
+
+@dataclass
+class Config:
+    base_saturation: float = 0.2
+
+    bonus_smelting: int = 2
+    bonus_saturation: float = 0.6
+    incompatible_with_saturation_bonus: list = field(default_factory=lambda: ["smelting", "inheritance"])
+
+    # Entries scoring below the threshold get the low bonus instead of bonus_saturation
+    low_saturation_threshold: float = 0.6
+    low_saturation_bonus: float = 0.4
+
+    # Lower saturation bounds of the Low, Normal, Good and Great food qualities, Poor foods being below the first one
+    quality_thresholds: list = field(default_factory=lambda: [0.6, 1.2, 1.8, 2.4])
+
+    # Values used in place of ingredients that are missing or part of a circular recipe.
+    # When None, such ingredients are reported and the parser stops before processing anything.
+    # e.g. {'hunger': 0, 'saturationModifier': 0.2, 'foodGroups': []}
+    unresolved_ingredient: dict = None
+
+    def get_hash(self):
+        # Resolved values depend on every setting, changing any of them invalidates saved results
+        return hashlib.sha1(json.dumps(asdict(self), sort_keys=True).encode()).hexdigest()
+
+    def replace(self, values):
+        # Copy of the config with the settings of [values] changed, checked against the fields above
+        settings = asdict(self)
+        types = {setting.name: setting.type for setting in fields(self)}
+        for name, value in values.items():
+            if name not in types:
+                raise ValueError(f'Unknown setting "{name}", expected one of {", ".join(types)}')
+            if not is_valid(value, types[name]):
+                raise ValueError(f'Setting "{name}" must be a {types[name].__name__}, got {value!r}')
+            settings[name] = value
+
+        if settings['quality_thresholds'] != sorted(settings['quality_thresholds']):
+            raise ValueError('Setting "quality_thresholds" must be in increasing order')
+
+        unresolved = settings['unresolved_ingredient']
+        if unresolved is not None and sorted(unresolved) != sorted(unresolved_fields):
+            raise ValueError(f'Setting "unresolved_ingredient" must have the keys {", ".join(unresolved_fields)}, got {unresolved!r}')
+
+        return Config(**settings)
+
+
+# Fields of Config.unresolved_ingredient, one value per converted field
+unresolved_fields = ('hunger', 'saturationModifier', 'foodGroups')
+
+
+def is_valid(value, expected):
+    if isinstance(value, bool):
+        return False
+    if expected in (int, float):
+        # Integer settings only need to be numbers, the values they are added to being truncated afterwards
+        return isinstance(value, (int, float))
+    if expected is dict:
+        return value is None or isinstance(value, dict)
+    return isinstance(value, expected)
+
+
+def load_config(filename, config=None):
+    # Settings of a JSON config file, e.g. {"base_saturation": 0.3, "bonus_smelting": 1}, the others keep their default
+    with open(filename, 'r') as f:
+        values = json.load(f)
+    if not isinstance(values, dict):
+        raise ValueError(f'{filename} must contain a JSON object of settings')
+
+    return (config or Config()).replace(values)
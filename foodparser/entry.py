@@ -0,0 +1,101 @@
+import sys
+
+
+class Missing:
+    # Stands for a field the entry does not have, null being a valid value in Raw_FoodValues.json
+    __slots__ = ()
+
+    def __repr__(self):
+        return 'missing'
+
+
+missing = Missing()
+
+# Fields of Raw_FoodValues.json stored in their own slot, any other field is kept in Entry.extra
+attributes = {
+    'name': 'name',
+    'meta': 'meta',
+    'hunger': 'hunger',
+    'saturationModifier': 'saturation',
+    'foodGroups': 'food_groups',
+    'hungerModifier': 'hunger_modifier',
+    'type': 'type',
+    'appendGroups': 'append_groups',
+    'removeGroups': 'remove_groups',
+    'componentItems': 'component_items',
+    'componentSaturations': 'component_saturations',
+}
+
+# Fields the stages may add to an entry, in the order they add them
+added_fields = ('foodGroups', 'saturationModifier', 'componentItems', 'componentSaturations')
+
+# Entries of a pack share a handful of field orders, each one is stored once
+field_orders = {}
+
+
+class Entry:
+    # Compact record of a food or ingredient. [key] is the interned "modID:name:meta" the entry is referred to by,
+    # the *_resolved flags are set once the matching value is final and can be used by the entries depending on it
+
+    __slots__ = ('key', 'fields', 'extra', 'hunger_resolved', 'saturation_resolved', 'groups_resolved', *attributes.values())
+
+    def __init__(self, raw):
+        self.update(raw)
+
+    def update(self, raw):
+        # Replaces every value of the entry with those of [raw]
+        self.name = sys.intern(raw['name'])
+        self.meta = raw.get('meta', missing)
+        self.hunger = intern_value(raw.get('hunger', missing))
+        self.saturation = intern_value(raw.get('saturationModifier', missing))
+        self.food_groups = intern_value(raw.get('foodGroups', missing))
+        self.hunger_modifier = raw.get('hungerModifier', missing)
+        self.type = raw.get('type', missing)
+        self.append_groups = raw.get('appendGroups', missing)
+        self.remove_groups = raw.get('removeGroups', missing)
+        self.component_items = raw.get('componentItems', missing)
+        self.component_saturations = raw.get('componentSaturations', missing)
+
+        fields = tuple(raw)
+        self.fields = field_orders.setdefault(fields, fields)
+        self.extra = {field: value for field, value in raw.items() if field not in attributes} or None
+
+        self.key = sys.intern(f'{self.name}:{0 if self.meta is missing else self.meta}')
+        self.hunger_resolved = isinstance(self.hunger, int)
+        self.saturation_resolved = isinstance(self.saturation, float)
+        self.update_groups_resolved()
+
+    def update_groups_resolved(self):
+        self.groups_resolved = isinstance(self.food_groups, list) and not any(":" in element for element in self.food_groups)
+
+    def to_dict(self, excluded=()):
+        # Fields in their original order, followed by those added while resolving the entry
+        raw = {}
+        for field in self.fields:
+            value = getattr(self, attributes[field]) if field in attributes else self.extra[field]
+            if value is not missing and field not in excluded:
+                raw[field] = value
+
+        for field in added_fields:
+            value = getattr(self, attributes[field])
+            if value is not missing and field not in self.fields and field not in excluded:
+                raw[field] = value
+
+        return raw
+
+    def __repr__(self):
+        return f'Entry({self.to_dict()!r})'
+
+
+def intern_value(value):
+    # Names and ingredients repeat across thousands of recipes, interning keeps a single copy of each
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, list):
+        return [intern_value(element) for element in value]
+    return value
+
+
+def read_entries(json_data):
+    # Converts every entry of a parsed Raw_FoodValues.json, [json_data] is left untouched
+    return {group_name: [Entry(entry) for entry in entries] for group_name, entries in json_data.items()}
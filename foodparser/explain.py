@@ -0,0 +1,288 @@
+import argparse
+import json
+import sys
+from collections import defaultdict
+from timeit import default_timer as timer
+
+from .config import Config, load_config
+from .entry import Entry, missing, read_entries
+from .food_groups import get_registered_groups
+from .graph import build_dependency_graph, categories, find_unresolvable_cycles, get_ingredient_list, validate_dependency_graph
+from .hunger import find_hunger_source
+from .index import FoodIndex
+from .items import get_food_name, get_item_key, initiate_food_group_list_from_ingredients
+from .logs import setup_logging
+from .parser import FoodParser
+
+# Derivation of the values of a single item, e.g. python -m foodparser.explain minecraft:bread:0
+# Only the item and the entries its recipes may depend on are converted and resolved, the rest of the pack is only read
+
+
+def get_subtree(raw_entries, food_name):
+    # Entries named [food_name] and every entry their ingredients may refer to, by position in file order.
+    # Ingredients are followed by name only, every meta included, so only these entries are ever converted
+    names = defaultdict(list)
+    for position, raw in enumerate(raw_entries):
+        names[raw['name']].append(position)
+
+    subtree = {}
+    pending = [food_name]
+    visited = {food_name}
+    while pending:
+        for position in names.get(pending.pop(), ()):
+            entry = subtree[position] = Entry(raw_entries[position])
+            for category in categories:
+                for ingredient in get_ingredient_list(entry, category):
+                    name = get_food_name(ingredient)
+                    if name not in visited:
+                        visited.add(name)
+                        pending.append(name)
+
+    return dict(sorted(subtree.items()))
+
+
+def explain_item(json_data, item, config=None, depth=None):
+    # Derivation trees of every entry registered as [item] in a parsed Raw_FoodValues.json, see explain_entry().
+    # [json_data] is left untouched
+    key = get_item_key(item)
+    raw_entries = [raw for entries in json_data.values() for raw in entries]
+    subtree = get_subtree(raw_entries, get_food_name(key))
+    positions = [position for position, entry in subtree.items() if entry.key == key]
+    if not positions:
+        raise KeyError(f'No entry "{key}" in this pack')
+
+    # Resolved in a pack of their own, file order being kept so that hunger values are chosen the same way
+    parser = FoodParser(config)
+    groups = {'entries': list(subtree.values())}
+    graph = build_dependency_graph(FoodIndex(groups))
+    local = {position: number for number, position in enumerate(subtree)}
+
+    if any(find_unresolvable_cycles(graph, category) for category in categories):
+        # Which recipe of a cycle is dropped depends on every entry before it in the file, the whole pack is read
+        # and only the subtree resolved, the other entries being skipped as if restored by an incremental run
+        groups = read_entries(json_data)
+        graph = parser.build_graph(groups)
+        graph['restored'] = set(range(len(raw_entries))).difference(subtree)
+        local = {position: position for position in subtree}
+    else:
+        graph['problems'] = validate_dependency_graph(graph)
+
+    parser.check_problems(graph)
+    result = parser.resolve_values(groups, graph)
+
+    raw = {local[position]: raw_entries[position] for position in subtree}
+    explained = set()
+    return [explain_entry(result.graph, raw, local[position], result.config, explained, depth) for position in positions]
+
+
+def explain_entry(graph, raw, position, config, explained, depth=None):
+    # Values of the entry at [position] with the values each was computed from, ingredients being explained in turn.
+    # Ingredients already explained elsewhere in the tree, or deeper than [depth], are only named
+    entry = graph['entries'][position]
+    explained.add(position)
+    node = {
+        'item': entry.key,
+        'hunger': explain_hunger(graph, raw[position], position, config),
+        'saturationModifier': explain_saturation(graph, raw[position], position, config),
+        'foodGroups': explain_food_groups(graph, raw[position], position, config),
+        'ingredients': [],
+    }
+
+    targets = sorted({target for category in categories for ingredient, found in graph[category][position] for target in found})
+    for target in targets:
+        if target in explained:
+            node['ingredients'].append({'item': graph['entries'][target].key, 'explained': True})
+        elif depth == 0:
+            node['ingredients'].append({'item': graph['entries'][target].key})
+        else:
+            node['ingredients'].append(explain_entry(graph, raw, target, config, explained, None if depth is None else depth - 1))
+
+    return node
+
+
+def explain_hunger(graph, raw, position, config):
+    entry = graph['entries'][position]
+    values = raw.get('hunger', missing)
+    if not isinstance(values, list):
+        return {'value': entry.hunger, 'given': values is not missing}
+
+    fallbacks = graph['fallbacks']['hunger'].get(position, ())
+    components = []
+    for element in values:
+        if element in fallbacks:
+            components.append({'ingredient': element, 'value': config.unresolved_ingredient['hunger'], 'unresolved': True})
+        elif isinstance(element, str):
+            source, cycle = find_hunger_source(graph['index'], element, position, graph['conversion_cycles'])
+            components.append({'ingredient': element, 'value': None if source is None else graph['entries'][source].hunger,
+                               'from': None if source is None else graph['entries'][source].key})
+        else:
+            components.append({'value': element})
+
+    explanation = {'value': entry.hunger, 'components': components}
+    if entry.hunger_resolved:
+        explanation['sum'] = sum(component['value'] for component in components)
+        explanation['smeltingBonus'] = config.bonus_smelting if entry.type == 'smelting' else 0
+        explanation['hungerModifier'] = 1 if entry.hunger_modifier is missing else entry.hunger_modifier
+    return explanation
+
+
+def explain_saturation(graph, raw, position, config):
+    entry = graph['entries'][position]
+    values = raw.get('saturationModifier', missing)
+    if values is missing:
+        # See saturation.sanitize_saturation_entries()
+        values = raw.get('hunger', missing)
+        if not isinstance(values, list):
+            return {'value': entry.saturation, 'given': False}
+    if not isinstance(values, list):
+        return {'value': entry.saturation, 'given': True}
+
+    fallbacks = graph['fallbacks']['saturationModifier'].get(position, ())
+    sources = iter(graph['saturationModifier'][position])
+    scores = entry.component_saturations if isinstance(entry.component_saturations, list) else [None] * len(values)
+    components = []
+    for element, score in zip(values, scores):
+        if element in fallbacks:
+            components.append({'ingredient': element, 'value': score, 'unresolved': True})
+        elif isinstance(element, str):
+            found = next(sources)[1]
+            components.append({'ingredient': element, 'value': score, 'from': graph['entries'][found[0]].key if found else None})
+        else:
+            components.append({'value': score})
+
+    explanation = {'value': entry.saturation, 'components': components}
+    if entry.saturation_resolved and all(isinstance(score, float) for score in scores):
+        # See saturation.finalize_saturation_score()
+        top_score = max(scores)
+        final_score = max(top_score, config.base_saturation)
+        if entry.type is not missing and entry.type in config.incompatible_with_saturation_bonus:
+            bonus, rule = 0, f'none for type "{entry.type}"'
+        elif final_score < config.low_saturation_threshold:
+            bonus, rule = config.low_saturation_bonus, f'low, below {config.low_saturation_threshold}'
+        else:
+            bonus, rule = config.bonus_saturation, 'regular'
+        explanation.update({'topScore': top_score, 'minimum': config.base_saturation, 'bonus': bonus, 'bonusRule': rule})
+    return explanation
+
+
+def explain_food_groups(graph, raw, position, config):
+    entry = graph['entries'][position]
+    values = raw.get('foodGroups', missing)
+    if values is missing:
+        # See food_groups.process_food_groups()
+        hunger = raw.get('hunger', missing)
+        if isinstance(hunger, list):
+            values = initiate_food_group_list_from_ingredients([element for element in hunger if isinstance(element, str)])
+        elif hunger is not missing:
+            values = ['None']
+    if not isinstance(values, list):
+        return {'value': entry.food_groups}
+
+    fallbacks = graph['fallbacks']['foodGroups'].get(position, ())
+    targets = {ingredient: found for ingredient, found in graph['foodGroups'][position]}
+    components = []
+    for element in values:
+        if element in fallbacks:
+            components.append({'ingredient': element, 'groups': config.unresolved_ingredient['foodGroups'], 'unresolved': True})
+        elif ":" in element:
+            found = targets.get(element, ())
+            groups = sorted({group for target in found if graph['entries'][target].groups_resolved
+                             for group in get_registered_groups(graph, position, target)})
+            components.append({'ingredient': element, 'groups': groups, 'from': [graph['entries'][target].key for target in found]})
+        else:
+            components.append({'groups': [element]})
+
+    explanation = {'value': entry.food_groups, 'components': components}
+    for field in ('appendGroups', 'removeGroups'):
+        if isinstance(raw.get(field), list):
+            explanation[field] = raw[field]
+    return explanation
+
+
+def format_tree(node, level=0):
+    # Text rendering of explain_entry() results
+    pad = '    ' * level
+    if 'hunger' not in node:
+        return [f'{pad}{node["item"]} ({"see above" if node.get("explained") else "not expanded"})']
+
+    lines = [f'{pad}{node["item"]}']
+    hunger = node['hunger']
+    if 'components' in hunger:
+        parts = ' + '.join(format_component(component) for component in hunger['components'])
+        line = f'{pad}  hunger {hunger["value"]}: {parts}'
+        if 'sum' in hunger:
+            line += f' = {hunger["sum"]}, smelting bonus +{hunger["smeltingBonus"]}, modifier x{hunger["hungerModifier"]}'
+        lines.append(line)
+    else:
+        lines.append(f'{pad}  hunger {hunger["value"]} ({"given" if hunger["given"] else "default"})')
+
+    saturation = node['saturationModifier']
+    if 'components' in saturation:
+        parts = ', '.join(format_component(component) for component in saturation['components'])
+        line = f'{pad}  saturation {saturation["value"]}: max of {parts}'
+        if 'topScore' in saturation:
+            line += (f' = {saturation["topScore"]}, minimum {saturation["minimum"]}, '
+                     f'bonus +{saturation["bonus"]} ({saturation["bonusRule"]})')
+        lines.append(line)
+    else:
+        lines.append(f'{pad}  saturation {saturation["value"]} ({"given" if saturation["given"] else "default"})')
+
+    groups = node['foodGroups']
+    line = f'{pad}  groups {groups["value"]}'
+    if 'components' in groups:
+        line += ': ' + ', '.join(f'{component.get("ingredient", "given")} {component["groups"]}' for component in groups['components'])
+    if 'appendGroups' in groups:
+        line += f', append {groups["appendGroups"]}'
+    if 'removeGroups' in groups:
+        line += f', remove {groups["removeGroups"]}'
+    lines.append(line)
+
+    for ingredient in node['ingredients']:
+        lines.extend(format_tree(ingredient, level + 1))
+    return lines
+
+
+def format_component(component):
+    if 'ingredient' not in component:
+        return str(component['value'])
+    if component.get('unresolved'):
+        return f'{component["value"]} (stand-in for {component["ingredient"]})'
+    return f'{component["value"]} ({component.get("from") or component["ingredient"]})'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Explains how the values of a single item are derived.')
+    parser.add_argument('item', help='item to explain, e.g. minecraft:bread:0')
+    parser.add_argument('--input', default='Raw_FoodValues.json', help='raw food values (default: Raw_FoodValues.json)')
+    parser.add_argument('--config', help='JSON file of the settings to change, see config.Config')
+    parser.add_argument('--depth', type=int, help='levels of ingredients explained (default: all)')
+    parser.add_argument('--json', action='store_true', help='print the derivation trees as JSON')
+    arguments = parser.parse_args(argv)
+
+    start = timer()
+    setup_logging('OFF')
+    with open(arguments.input, 'r') as f:
+        json_data = json.load(f)
+    config = load_config(arguments.config) if arguments.config else Config()
+
+    try:
+        trees = explain_item(json_data, arguments.item, config, arguments.depth)
+    except KeyError as e:
+        print(e.args[0])
+        return 1
+    except ValueError as e:
+        # Unresolvable ingredients, one per line, see FoodParser.check_problems()
+        print(e)
+        return 1
+
+    if arguments.json:
+        print(json.dumps(trees, indent=4))
+    else:
+        for tree in trees:
+            print('\n'.join(format_tree(tree)))
+        print(f'Explained in {round(timer() - start, 3)} seconds')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
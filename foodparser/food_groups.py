@@ -0,0 +1,165 @@
+import logging
+
+from .entry import missing
+from .graph import topological_order
+
+logger = logging.getLogger('FoodParser')
+
+
+def successful_food_groups_conversion(entries):
+    for entry in entries:
+        if not entry.groups_resolved:
+            logger.info('Entry "%s" does not appear to have been fully converted:', entry.name)
+            if entry.food_groups is not missing:
+                missing_conversions = [item for item in entry.food_groups if ":" in item]
+                logger.info('"Invalid conversions:" = %s', missing_conversions)
+            else:
+                logger.info('"foodGroups" entry cannot be found for this item.')
+
+            return False
+    return True
+
+
+class GroupMasks:
+    # Food groups as bits of an integer: a pack only uses a dozen of them, merging groups is then a bitwise OR
+
+    def __init__(self):
+        self.bits = {}
+        self.names = {}
+
+    def get_mask(self, names):
+        mask = 0
+        for name in names:
+            bit = self.bits.get(name)
+            if bit is None:
+                bit = self.bits[name] = 1 << len(self.bits)
+            mask |= bit
+        return mask
+
+    def get_names(self, mask):
+        # Sorted names of [mask], each distinct mask is only converted once
+        names = self.names.get(mask)
+        if names is None:
+            names = self.names[mask] = sorted(name for name, bit in self.bits.items() if mask & bit)
+        return list(names)
+
+
+def replace_entries(input_list, masks, item_masks, fallbacks=(), unresolved_ingredient=None):
+    # Returns the mask of the groups [input_list] resolves to, and the ingredients that could not be replaced
+    mask = 0
+    unresolved = []
+
+    for item in input_list:
+        if item in fallbacks:
+            mask |= masks.get_mask(unresolved_ingredient['foodGroups'])
+        elif item in item_masks:
+            mask |= item_masks[item]
+        elif ":" in item:
+            if item not in unresolved:
+                unresolved.append(item)
+        else:
+            mask |= masks.get_mask([item])
+
+    return mask & ~masks.get_mask(['None']), unresolved
+
+
+def get_registered_groups(graph, index, target):
+    # Groups [target] had registered when the ingredients of entry [index] were replaced, see graph.prune_group_candidates()
+    written = graph['written_groups'].get(target, [])
+    if target in graph['written_only'].get(index, ()):
+        return written
+    return graph['entries'][target].food_groups + written
+
+
+def register_food_groups(graph, masks, entry_masks, index):
+    # Register the finished entry for the entries depending on it
+    if graph['entries'][index].groups_resolved:
+        entry_masks[index] = masks.get_mask(graph['entries'][index].food_groups + graph['written_groups'].get(index, []))
+
+
+def get_item_masks(graph, masks, entry_masks, edge_masks, index):
+    # Groups each ingredient of entry [index] is replaced with, for those with a registered target. Edges are shared by
+    # the entries listing the same ingredient, their groups are the same for all of them unless some targets of the entry
+    # had only registered their groups as written
+    written_only = graph['written_only'].get(index, ())
+    item_masks = {}
+    for edge in graph['foodGroups'][index]:
+        mask = None if written_only else edge_masks.get(id(edge))
+        if mask is None:
+            for target in edge[1]:
+                if target not in entry_masks and target in graph['restored']:
+                    # Restored entries are only registered once an entry depends on them
+                    register_food_groups(graph, masks, entry_masks, target)
+                if target in written_only:
+                    mask = (mask or 0) | masks.get_mask(graph['written_groups'][target])
+                elif target in entry_masks:
+                    mask = (mask or 0) | entry_masks[target]
+            if mask is None:
+                continue
+            if not written_only:
+                edge_masks[id(edge)] = mask
+        item_masks[edge[0]] = item_masks.get(edge[0], 0) | mask
+    return item_masks
+
+
+def process_food_groups(graph, config):
+    processed_group_food = 0
+    masks = GroupMasks()
+    # Registered groups of every finished entry, and those each ingredient is replaced with
+    entry_masks = {}
+    edge_masks = {}
+
+    for index in topological_order(graph, 'foodGroups'):
+        entry = graph['entries'][index]
+
+        if index in graph['restored']:
+            continue
+
+        # Generate missing list for entries that require it
+        if entry.food_groups is missing:
+            if entry.hunger is not missing:
+                if isinstance(entry.hunger, list):
+                    # The ingredients initiate_food_group_list_from_ingredients() returns, already listed by the graph
+                    entry.food_groups = [ingredient for ingredient, targets in graph['foodGroups'][index]]
+                    entry.food_groups += graph['fallbacks']['foodGroups'].get(index, ())
+                else:
+                    entry.food_groups = ['None']
+
+        if isinstance(entry.food_groups, list):
+            unresolved = []
+            if any(":" in element for element in entry.food_groups):
+                # Replace values with their groups, every ingredient has already been registered
+                mask, unresolved = replace_entries(
+                    entry.food_groups, masks, get_item_masks(graph, masks, entry_masks, edge_masks, index),
+                    graph['fallbacks']['foodGroups'].get(index, ()), config.unresolved_ingredient)
+                if not unresolved:
+                    processed_group_food += 1
+            elif not isinstance(entry.append_groups, list):
+                # Nothing to merge, the list is kept as it is written
+                mask = None
+            else:
+                mask = masks.get_mask(entry.food_groups)
+
+            # Process additions or deletions, then make it tidy
+            if mask is None:
+                entry.food_groups = sorted(entry.food_groups if not isinstance(entry.remove_groups, list) else
+                                           [group for group in entry.food_groups if group not in entry.remove_groups])
+            else:
+                if isinstance(entry.append_groups, list):
+                    mask |= masks.get_mask(entry.append_groups)
+                if isinstance(entry.remove_groups, list):
+                    mask &= ~masks.get_mask(entry.remove_groups)
+                    unresolved = [item for item in unresolved if item not in entry.remove_groups]
+                entry.food_groups = sorted(masks.get_names(mask) + unresolved) if unresolved else masks.get_names(mask)
+            entry.update_groups_resolved()
+
+        register_food_groups(graph, masks, entry_masks, index)
+
+    logger.info('Processed %d food group entries.', processed_group_food)
+
+    if successful_food_groups_conversion(graph['entries']):
+        logger.info('Success!')
+    else:
+        logger.info('Food groups conversion incomplete.')
+
+    return processed_group_food
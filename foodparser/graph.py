@@ -0,0 +1,535 @@
+import logging
+from collections import defaultdict, deque
+
+from .entry import missing
+from .items import get_food_name, get_group_key, initiate_food_group_list_from_ingredients, is_item_key, parse_item_key
+
+logger = logging.getLogger('FoodParser')
+
+categories = ['foodGroups', 'saturationModifier', 'hunger']
+
+
+def get_ingredient_list(entry, category):
+    # Returns the ingredients [category] is computed from, as they will be looked up
+    if category == 'foodGroups':
+        if entry.food_groups is not missing:
+            if isinstance(entry.food_groups, list):
+                return [element for element in entry.food_groups if ":" in element]
+            return []
+        if isinstance(entry.hunger, list):
+            return initiate_food_group_list_from_ingredients([element for element in entry.hunger if isinstance(element, str)])
+        return []
+
+    if category == 'saturationModifier':
+        if entry.saturation is not missing:
+            ingredients = entry.saturation
+        else:
+            # See saturation.sanitize_saturation_entries()
+            ingredients = entry.hunger
+    else:
+        ingredients = entry.hunger
+
+    if isinstance(ingredients, list):
+        return [element for element in ingredients if isinstance(element, str)]
+    return []
+
+
+def get_value_kind(value):
+    # Type of [value], of each element for lists
+    if isinstance(value, list):
+        return tuple(map(type, value))
+    return type(value)
+
+
+def get_entry_shape(entry):
+    # Everything the dependency graph reads from an unresolved entry: its item key, its ingredients and the type of its
+    # values (see find_dependencies(), prune_group_candidates(), replay_saturation_sources() and prune_hunger_candidates()).
+    # Entries of the same shape are linked the same way whatever their values
+    return (entry.name, entry.meta, *map(get_value_kind, (entry.hunger, entry.saturation, entry.food_groups,
+                                                          entry.append_groups, entry.remove_groups)),
+            *(tuple(get_ingredient_list(entry, category)) for category in categories))
+
+
+def find_dependencies(index, category, ingredient):
+    # Mirrors the lookup rules each stage applies when converting [ingredient]
+    if category == 'foodGroups':
+        # Every entry registered under "modID:name:meta", see prune_group_candidates() for those actually merged
+        return [position for position in index.find_named(get_food_name(ingredient))
+                if index.entries[position].key == ingredient]
+
+    if category == 'saturationModifier':
+        # The first entry matching both name and meta with a numerical saturationModifier (or the default one), then the
+        # first with a recipe. When entries share an item key, replay_saturation_sources() picks the one actually used
+        recipes = []
+        for position in index.find_entries(*parse_item_key(ingredient)):
+            entry = index.entries[position]
+            saturation = entry.hunger if entry.saturation is missing else entry.saturation
+            if saturation is missing:
+                continue
+            if not isinstance(saturation, list):
+                return [position]
+            recipes.append(position)
+        return recipes[:1]
+
+    # get_hunger_value() may use any entry the ingredient refers to, depending on when each one was converted
+    return [position for position in index.find_item(ingredient)
+            if isinstance(index.entries[position].hunger, (int, list))]
+
+
+def build_dependency_graph(index):
+    # Links every entry to the entries its ingredients resolve to, once, for each converted category
+    graph = {'index': index, 'entries': index.entries, 'fallbacks': {}, 'restored': set(), 'conversion_cycles': {}, 'orders': {},
+             'group_cycles': {}, 'written_groups': {}, 'written_only': {}, 'saturation_sources': {}, 'dependents': None}
+    for category in categories:
+        # An ingredient resolves to the same entries in every recipe, each (ingredient, targets) edge is built once and shared
+        edges = {}
+        graph[category] = []
+        for entry in index.entries:
+            dependencies = []
+            for ingredient in get_ingredient_list(entry, category):
+                edge = edges.get(ingredient)
+                if edge is None:
+                    edge = edges[ingredient] = (ingredient, tuple(find_dependencies(index, category, ingredient)))
+                dependencies.append(edge)
+            graph[category].append(dependencies)
+
+        graph['fallbacks'][category] = defaultdict(set)
+
+    prune_group_candidates(graph)
+    replay_saturation_sources(graph)
+    return graph
+
+
+def prune_group_candidates(graph):
+    # The fixed-point loop went over the groups of the pack ("foods", "ingredients") once per cycle. In each one it first
+    # registered the food groups of its finished entries under their "modID:name:meta", then replaced every ingredient
+    # already registered with the groups registered so far. Entries finished by then were registered on the next cycle,
+    # entries whose groups are written in the pack were registered as written on the first one, then with appendGroups
+    # and removeGroups applied.
+    # The cycle each entry was first registered on only depends on the recipes, it is replayed here (see
+    # prune_hunger_candidates()). Each ingredient keeps the entries registered by the time it was replaced, and
+    # [written_only] those of them which had only registered their groups as written
+    entries = graph['entries']
+    groups = graph['index'].groups
+    dependencies = graph['foodGroups']
+    written = graph['written_groups']
+    # Cycle the entries waiting for their ingredients have all of them replaced on
+    replaced = [None] * len(entries)
+    waiting = [0] * len(entries)
+    # Edges are shared by the entries listing the same ingredient, their first registration is that of the ingredient
+    waiters = defaultdict(list)
+    target_edges = defaultdict(list)
+    first = {}
+    levels = defaultdict(list)
+
+    for index, entry in enumerate(entries):
+        if isinstance(entry.food_groups, list):
+            if not any(":" in element for element in entry.food_groups):
+                levels[0].append(index)
+                if isinstance(entry.append_groups, list) or isinstance(entry.remove_groups, list):
+                    written[index] = list(entry.food_groups)
+                continue
+        elif entry.food_groups is not missing or entry.hunger is missing:
+            continue
+        elif not isinstance(entry.hunger, list):
+            # Given ['None'] once the first registration of its group is over
+            levels[1].append(index)
+            continue
+
+        replaced[index] = 0
+
+    # Each ingredient is replaced by the groups of its only candidate when no entry has written groups to register first
+    if not written and all(len(edge[1]) <= 1 for ingredients in dependencies for edge in ingredients):
+        return
+
+    for index, ingredients in enumerate(dependencies):
+        if replaced[index] is None:
+            continue
+
+        # Ingredients without any candidate take the stand-in value, they do not delay the entry
+        for edge in ingredients:
+            if edge[1]:
+                waiting[index] += 1
+                if id(edge) not in waiters:
+                    for target in edge[1]:
+                        target_edges[target].append(edge)
+                waiters[id(edge)].append(index)
+        if not waiting[index]:
+            levels[1].append(index)
+
+    cycles = graph['group_cycles']
+    cycle = 0
+    while cycle <= max(levels, default=-1):
+        completed = []
+        # Entries of the first groups are registered first. An ingredient is replaced on the cycle of its first
+        # registration in the groups up to its entry's, otherwise on the next one
+        for candidate in sorted(levels.pop(cycle, ()), key=lambda position: (groups[position], position)):
+            cycles[candidate] = cycle
+            for edge in target_edges[candidate]:
+                if id(edge) in first:
+                    continue
+                first[id(edge)] = (cycle, groups[candidate])
+                for index in waiters[id(edge)]:
+                    time = cycle + (groups[candidate] > groups[index])
+                    if time > replaced[index]:
+                        replaced[index] = time
+                    waiting[index] -= 1
+                    if not waiting[index]:
+                        completed.append(index)
+
+        for index in completed:
+            levels[replaced[index] + 1].append(index)
+        cycle += 1
+
+    for index, ingredients in enumerate(dependencies):
+        if index not in cycles or replaced[index] is None:
+            continue
+
+        pruned = []
+        for edge in ingredients:
+            ingredient, targets = edge
+            # A single target is the one the ingredient was replaced by, and had registered everything by then
+            if len(targets) > 1 or targets and targets[0] in written:
+                registration, group = first[id(edge)]
+                time = (registration + (group > groups[index]), groups[index])
+                kept = tuple(target for target in targets if target in cycles and (cycles[target], groups[target]) <= time)
+                if kept != targets:
+                    edge = (ingredient, kept)
+                early = [target for target in kept if target in written and (1, groups[target]) > time]
+                if early:
+                    graph['written_only'].setdefault(index, set()).update(early)
+            pruned.append(edge)
+        dependencies[index] = pruned
+
+
+def replay_saturation_sources(graph):
+    # The fixed-point loop went over every entry of the pack in file order, once per pass. It turned integers into
+    # floats, finalized lists whose every element was a number, and converted the others, once for each element left to
+    # convert. Converting an ingredient took the first entry matching it with a float at that moment. Entries before it
+    # were not used even if the lookup finalized them, and those with a list had their own ingredients looked up in turn
+    # for the entries that could be finalized on the way.
+    # With a single entry per item key that entry is always the one used, otherwise the passes are replayed here with
+    # the state of each entry, as the values do not change when entries are converted. Each ingredient is then linked
+    # to its own source, ingredients listed twice by a recipe may have different ones
+    index = graph['index']
+    entries = graph['entries']
+    if all(len(positions) <= 1 for positions in index.keys.values()) and not any(
+            meta is not None and (name, None) in index.keys for name, meta in index.keys):
+        return
+
+    dependencies = graph['saturationModifier']
+    numerical, integer, recipe, finished, other = range(5)
+    states = []
+    # Ingredients of each recipe left to convert, as (occurrence, ingredient) in list order
+    remaining = {}
+    for position, entry in enumerate(entries):
+        saturation = entry.saturation
+        if saturation is missing:
+            saturation = entry.hunger if isinstance(entry.hunger, list) else 0.0 if entry.hunger is not missing else missing
+        if isinstance(saturation, float):
+            states.append(numerical)
+        elif isinstance(saturation, int):
+            states.append(integer)
+        elif isinstance(saturation, list):
+            remaining[position] = list(enumerate(edge[0] for edge in dependencies[position]))
+            states.append(recipe if remaining[position] else finished)
+        else:
+            states.append(other)
+
+    candidates = {}
+    # Ingredients whose lookup would not finalize anything more until another recipe has all of its elements converted
+    explored = set()
+    changes = 0
+
+    def get_candidates(ingredient):
+        found = candidates.get(ingredient)
+        if found is None:
+            found = candidates[ingredient] = [position for position in index.find_entries(*parse_item_key(ingredient))
+                                              if states[position] != other]
+        return found
+
+    def look_up(ingredient):
+        # Source of [ingredient], finalizing entries along the way like retrieve_saturation_score() did
+        nonlocal changes
+        if ingredient in explored:
+            return next((position for position in get_candidates(ingredient) if states[position] == numerical), None)
+
+        source = None
+        path = {ingredient}
+        frames = [[ingredient, iter(get_candidates(ingredient)), None]]
+        while frames:
+            frame = frames[-1]
+            if frame[2] is not None:
+                component = next(frame[2], None)
+                if component is None:
+                    frame[2] = None
+                elif component not in explored and component not in path:
+                    path.add(component)
+                    frames.append([component, iter(get_candidates(component)), None])
+                continue
+
+            position = next(frame[1], None)
+            if position is None or states[position] == numerical:
+                if len(frames) == 1:
+                    source = position
+                frames.pop()
+                path.discard(frame[0])
+                explored.add(frame[0])
+            elif states[position] == finished:
+                states[position] = numerical
+                changes += 1
+            elif states[position] == recipe:
+                frame[2] = iter([component for occurrence, component in remaining[position]])
+
+        return source
+
+    sources = {}
+    pending = [position for position, state in enumerate(states) if state in (integer, recipe, finished)]
+    while pending:
+        visited = changes
+        for position in pending:
+            if states[position] in (integer, finished):
+                states[position] = numerical
+                changes += 1
+            elif states[position] == recipe:
+                for attempt in range(len(remaining[position])):
+                    attempted = changes
+                    left = []
+                    for occurrence, ingredient in remaining[position]:
+                        source = look_up(ingredient) if get_candidates(ingredient) else None
+                        if source is None and candidates[ingredient]:
+                            left.append((occurrence, ingredient))
+                        else:
+                            sources[(position, occurrence)] = source
+                    changes += len(remaining[position]) - len(left)
+                    remaining[position] = left
+                    if not left:
+                        states[position] = finished
+                        explored.clear()
+                        break
+                    if changes == attempted:
+                        # Attempts left would look up the same entries again
+                        break
+
+        pending = [position for position in pending if states[position] != numerical]
+        if changes == visited:
+            # Entries left depend on each other, graph.validate_dependency_graph() reports them
+            break
+
+    edges = {}
+    for (position, occurrence), source in sources.items():
+        ingredient, targets = dependencies[position][occurrence]
+        if source is not None and targets != (source,):
+            edge = edges.get((ingredient, source))
+            if edge is None:
+                edge = edges[(ingredient, source)] = (ingredient, (source,))
+            dependencies[position][occurrence] = edge
+            graph['saturation_sources'][position] = [targets for ingredient, targets in dependencies[position]]
+
+
+def find_circular_dependencies(graph, category):
+    # Depth-first search over [category], every edge back into the current path closes a cycle.
+    # Each cycle is given once with every ingredient closing it, e.g. both "m:a" and "m:a:0" in a recipe of its last entry
+    dependencies = graph[category]
+    depth = [None] * len(dependencies)
+    finished = [False] * len(dependencies)
+    cycles = {}
+
+    def edges(index):
+        return ((ingredient, target) for ingredient, targets in dependencies[index] for target in targets)
+
+    for root in range(len(dependencies)):
+        if finished[root]:
+            continue
+
+        path = [root]
+        depth[root] = 0
+        stack = [edges(root)]
+        while stack:
+            for ingredient, target in stack[-1]:
+                if depth[target] is not None:
+                    # [target] is on the current path: the path from it back to itself is a cycle
+                    chain = path[depth[target]:] + [target]
+                    ingredients = cycles.setdefault(frozenset(chain), (chain, []))[1]
+                    if ingredient not in ingredients:
+                        ingredients.append(ingredient)
+                elif not finished[target]:
+                    depth[target] = len(path)
+                    path.append(target)
+                    stack.append(edges(target))
+                    break
+            else:
+                index = path.pop()
+                depth[index] = None
+                finished[index] = True
+                stack.pop()
+
+    return list(cycles.values())
+
+
+def prune_hunger_candidates(graph):
+    # A hunger ingredient is linked to every entry of that name, e.g. "minecraft:golden_apple" in the recipe of
+    # minecraft:golden_apple:1 also links it to itself. The fixed-point loop never used a candidate that was not
+    # numerical yet, so such links are not real cycles.
+    # The cycle on which each entry turned numerical only depends on the recipes, it is replayed here level by level
+    # (see hunger.find_hunger_source()) and every entry that turns numerical keeps only the candidates ready by the
+    # time it took its value, which all turned numerical before it. Entries that never do keep their links
+    entries = graph['entries']
+    dependencies = graph['hunger']
+    ready = [None] * len(entries)
+    waiting = [0] * len(entries)
+    dependents = defaultdict(list)
+    levels = defaultdict(list)
+
+    for index, entry in enumerate(entries):
+        if entry.hunger_resolved:
+            levels[-1].append(index)
+        elif isinstance(entry.hunger, list) and all(isinstance(element, (int, str)) for element in entry.hunger):
+            # Ingredients without any candidate take the stand-in value, they do not delay the entry
+            ready[index] = {ingredient: None for ingredient, targets in dependencies[index] if targets}
+            waiting[index] = len(ready[index])
+            for ingredient, targets in dependencies[index]:
+                for target in targets:
+                    dependents[target].append((index, ingredient))
+            if not waiting[index]:
+                levels[0].append(index)
+
+    conversion_cycles = {}
+    cycle = -1
+    while cycle <= max(levels, default=-1):
+        completed = []
+        level = levels.pop(cycle, ())
+        for candidate in level:
+            conversion_cycles[candidate] = cycle
+        for candidate in level:
+            for index, ingredient in dependents[candidate]:
+                if index in conversion_cycles:
+                    continue
+                candidate_ready = cycle + (candidate > index)
+                if ready[index][ingredient] is None:
+                    waiting[index] -= 1
+                    if not waiting[index]:
+                        completed.append(index)
+                    ready[index][ingredient] = candidate_ready
+                elif candidate_ready < ready[index][ingredient]:
+                    ready[index][ingredient] = candidate_ready
+
+        # Candidates of the next cycles are ready later, the values of [completed] are final
+        for index in completed:
+            levels[max((max(value, 0) for value in ready[index].values()), default=-1) + 1].append(index)
+        cycle += 1
+
+    for index, ingredients in enumerate(dependencies):
+        if index not in conversion_cycles or not ready[index]:
+            continue
+
+        pruned = []
+        for edge in ingredients:
+            ingredient, targets = edge
+            if targets:
+                cycle = max(ready[index][ingredient], 0)
+                kept = tuple(target for target in targets
+                             if target in conversion_cycles and conversion_cycles[target] + (target > index) <= cycle)
+                if kept != targets:
+                    edge = (ingredient, kept)
+            pruned.append(edge)
+        dependencies[index] = pruned
+
+
+def find_unresolvable_cycles(graph, category):
+    # Cycles of [category] left once hunger candidates that were never used are pruned
+    cycles = find_circular_dependencies(graph, category)
+    if cycles and category == 'hunger':
+        prune_hunger_candidates(graph)
+        cycles = find_circular_dependencies(graph, category)
+    return cycles
+
+
+def validate_dependency_graph(graph):
+    # Reports every ingredient that can never be resolved, before any processing takes place
+    entries = graph['entries']
+    # Categories each problem is found in, in order and without repeats
+    missing_ingredients = defaultdict(dict)
+    malformed = defaultdict(dict)
+    circular = {}
+
+    for category in categories:
+        offending = defaultdict(set)
+
+        for index, ingredients in enumerate(graph[category]):
+            for ingredient, targets in ingredients:
+                if not targets:
+                    offending[index].add(ingredient)
+                    if is_item_key(ingredient):
+                        missing_ingredients[(index, get_group_key(ingredient))][category] = True
+                    else:
+                        malformed[(index, ingredient)][category] = True
+
+        for chain, ingredients in find_unresolvable_cycles(graph, category):
+            offending[chain[-2]].update(ingredients)
+            circular.setdefault(frozenset(chain), (chain, {}))[1][category] = True
+
+        # Drop offending ingredients from the graph so the remaining entries can still be ordered
+        for index, ingredients in offending.items():
+            graph[category][index] = [edge for edge in graph[category][index] if edge[0] not in ingredients]
+            graph['fallbacks'][category][index] |= ingredients
+
+    # Orders and dependents computed so far no longer match the graph
+    graph['orders'].clear()
+    graph['dependents'] = None
+
+    problems = []
+    for (index, key), found_in in missing_ingredients.items():
+        problems.append(f'Missing ingredient "{key}" in "{entries[index].key}" ({", ".join(found_in)})')
+    for (index, ingredient), found_in in malformed.items():
+        problems.append(f'Malformed ingredient "{ingredient}" in "{entries[index].key}", expected "modID:name[:meta]" ({", ".join(found_in)})')
+    for chain, found_in in circular.values():
+        names = ' -> '.join(f'"{entries[index].key}"' for index in chain)
+        problems.append(f'Circular recipe {names} ({", ".join(found_in)})')
+
+    return problems
+
+
+def get_dependents(graph):
+    # Entries depending on each entry in any category, computed once for the graph
+    if graph['dependents'] is None:
+        dependents = [[] for _ in graph['entries']]
+        for category in categories:
+            for index, ingredients in enumerate(graph[category]):
+                for ingredient, targets in ingredients:
+                    for target in targets:
+                        dependents[target].append(index)
+        graph['dependents'] = dependents
+    return graph['dependents']
+
+
+def topological_order(graph, category):
+    # Orders entries so that each one comes after every entry it depends on (Kahn's algorithm)
+    if category in graph['orders']:
+        return graph['orders'][category]
+
+    dependencies = graph[category]
+    dependents = [[] for _ in dependencies]
+    pending = []
+
+    for index, ingredients in enumerate(dependencies):
+        targets = {target for ingredient, found in ingredients for target in found}
+        for target in targets:
+            dependents[target].append(index)
+        pending.append(len(targets))
+
+    queue = deque(index for index, count in enumerate(pending) if count == 0)
+    order = []
+    while queue:
+        index = queue.popleft()
+        order.append(index)
+        for dependent in dependents[index]:
+            pending[dependent] -= 1
+            if pending[dependent] == 0:
+                queue.append(dependent)
+
+    if len(order) < len(dependencies):
+        logger.warning('%d entries depend on each other and cannot be ordered for %s.', len(dependencies) - len(order), category)
+
+    graph['orders'][category] = order
+    return order
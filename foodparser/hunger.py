@@ -0,0 +1,96 @@
+import logging
+
+from .entry import missing
+from .graph import topological_order
+from .items import is_conversion_complete
+
+logger = logging.getLogger('FoodParser')
+
+
+def find_hunger_source(index, food_name, position, conversion_cycles):
+    # The fixed-point loop retried an ingredient on every cycle and took the first entry named [food_name]
+    # that was numerical at that moment. Entries behind [position] only counted from the cycle after their conversion.
+    candidates = [(conversion_cycles[candidate] + (candidate > position), candidate)
+                  for candidate in index.find_item(food_name) if candidate in conversion_cycles]
+
+    if candidates:
+        cycle = max(min(ready for ready, candidate in candidates), 0)
+        for ready, candidate in candidates:
+            if ready <= cycle:
+                return candidate, cycle
+
+    return None, None
+
+
+def get_hunger_value(index, food_name, position, conversion_cycles):
+    candidate, cycle = find_hunger_source(index, food_name, position, conversion_cycles)
+    if candidate is None:
+        return None, None
+    return index.entries[candidate].hunger, cycle
+
+
+def translate_hunger_value(index, lst, position, conversion_cycles, config, fallbacks=()):
+    modified_list = []
+    conversion_cycle = 0
+    for food in lst:
+        if food in fallbacks:
+            modified_list.append(config.unresolved_ingredient['hunger'])
+            continue
+
+        if isinstance(food, str):
+            value, cycle = get_hunger_value(index, food, position, conversion_cycles)
+            if cycle is not None:
+                modified_list.append(value)
+                # The entry itself turns numerical on the cycle after its last translation
+                conversion_cycle = max(conversion_cycle, cycle + 1)
+                continue
+        modified_list.append(food)
+    return modified_list, conversion_cycle
+
+
+def process_hunger_entries(graph, config):
+    processed_entries_hunger = 0
+
+    # Cycle on which each numerical entry would have been converted by the former fixed-point loop
+    conversion_cycles = graph['conversion_cycles']
+
+    for index in topological_order(graph, 'hunger'):
+        if index in graph['restored']:
+            continue
+
+        entry = graph['entries'][index]
+
+        if entry.hunger_resolved:
+            conversion_cycles[index] = -1
+
+        elif isinstance(entry.hunger, list):
+            conversion_cycle = 0
+            if any(isinstance(element, str) for element in entry.hunger):
+                # Translate strings into values
+                entry.hunger, conversion_cycle = translate_hunger_value(
+                    graph['index'], entry.hunger, index, conversion_cycles, config,
+                    graph['fallbacks']['hunger'].get(index, ()))
+
+            if all(isinstance(element, int) for element in entry.hunger):
+                # Sum hunger entries
+                hunger_modifier = 1 if entry.hunger_modifier is missing else entry.hunger_modifier
+                hunger_bonus = config.bonus_smelting if entry.type == 'smelting' else 0
+
+                value_hunger = sum(entry.hunger) + hunger_bonus
+
+                # We want entries with a value of exactly 0 to remain 0
+                # else we give it a minimum of 1
+                entry.hunger = max(int(value_hunger * hunger_modifier), 1) if not value_hunger == 0 else 0
+                entry.hunger_resolved = True
+                conversion_cycles[index] = conversion_cycle
+
+                processed_entries_hunger += 1
+
+    logger.info('Processed %d hunger entries.', processed_entries_hunger)
+
+    if is_conversion_complete(graph['entries'], 'hunger'):
+        logger.info('Success!')
+    else:
+        logger.info('Hunger conversion incomplete.')
+
+    return processed_entries_hunger
@@ -0,0 +1,207 @@
+import hashlib
+import json
+import logging
+import marshal
+import os
+from collections import defaultdict, deque
+from itertools import chain, repeat
+
+from .entry import missing
+from .graph import categories, get_dependents
+from .items import get_food_name
+from .output import write_output
+
+logger = logging.getLogger('FoodParser')
+
+state_title = 'incremental-state.json'
+
+
+def hash_entry(entry):
+    # Fields are hashed in their order, which the output keeps
+    return hashlib.sha1(repr(entry.to_dict()).encode()).hexdigest()
+
+
+def hash_entries(graph, groups):
+    # Identifies entries across runs by category, name and meta, numbering duplicates in file order.
+    # Must run before the entries are resolved
+    keys = []
+    hashes = []
+    occurrences = defaultdict(int)
+
+    for group_name, entries in groups.items():
+        for entry in entries:
+            key = f'{group_name}/{entry.key}'
+            keys.append(f'{key}#{occurrences[key]}')
+            occurrences[key] += 1
+            hashes.append(hash_entry(entry))
+
+    graph['keys'] = keys
+    graph['hashes'] = hashes
+
+
+def load_state(output_root, config):
+    try:
+        with open(os.path.join(output_root, state_title), 'r') as state_input:
+            state = json.load(state_input)
+    except (OSError, ValueError):
+        logger.info('No previous state found, rebuilding everything.')
+        return None
+
+    if state.get('config') != config.get_hash():
+        logger.info('Settings changed since the last run, rebuilding everything.')
+        return None
+
+    return state
+
+
+def restore_unchanged_entries(graph, state):
+    previous = {saved['key']: (position, saved) for position, saved in enumerate(state['entries'])}
+
+    # Entries sharing a name are resolved according to their order in the file, which moved entries would change
+    previous_positions = [previous[key][0] for key in graph['keys'] if key in previous]
+    if any(earlier > later for earlier, later in zip(previous_positions, previous_positions[1:])):
+        logger.info('Entries were reordered since the last run, rebuilding everything.')
+        return
+
+    changed = deque(index for index, (key, entry_hash) in enumerate(zip(graph['keys'], graph['hashes']))
+                    if key not in previous or previous[key][1]['hash'] != entry_hash
+                    or previous[key][1].get('saturationSources') != get_saturation_sources(graph, index))
+
+    # Entries referring to a removed entry may now resolve to another one, or fail to. So may those referring to a changed
+    # one, e.g. a saturationModifier turned from a number into a recipe (see graph.find_dependencies()), or to one
+    # registering its food groups on another cycle (see graph.prune_group_candidates()). Recipes whose saturation source
+    # changed with the order the passes reached entries are recomputed above (see graph.replay_saturation_sources())
+    current_keys = set(graph['keys'])
+    affected_names = {saved['name'] for key, (position, saved) in previous.items() if key not in current_keys}
+    affected_names.update(graph['entries'][index].name for index in changed)
+    affected_names.update(entry.name for index, (key, entry) in enumerate(zip(graph['keys'], graph['entries']))
+                          if key in previous and previous[key][1].get('groupsCycle') != graph['group_cycles'].get(index))
+    dependents = get_dependents(graph)
+    for category in categories:
+        for index, ingredients in enumerate(graph[category]):
+            fallbacks = graph['fallbacks'][category].get(index, set())
+            if any(get_food_name(ingredient) in affected_names for ingredient in [edge[0] for edge in ingredients] + list(fallbacks)):
+                changed.append(index)
+
+    # Invalidate changed entries and everything depending on them
+    invalidated = set(changed)
+    while changed:
+        for dependent in dependents[changed.popleft()]:
+            if dependent not in invalidated:
+                invalidated.add(dependent)
+                changed.append(dependent)
+
+    for index, (key, entry) in enumerate(zip(graph['keys'], graph['entries'])):
+        if index not in invalidated:
+            saved = previous[key][1]
+            entry.update(saved['resolved'])
+            if saved['conversionCycle'] is not None:
+                graph['conversion_cycles'][index] = saved['conversionCycle']
+            graph['restored'].add(index)
+
+    logger.info('Reusing %d entries, recomputing %d entries.', len(graph["restored"]), len(invalidated))
+
+
+def find_changed_entries(previous, json_data):
+    # Entries of [json_data] which differ from those of [previous], an earlier version of the same pack, as
+    # {position: (raw, previous raw)}. None when entries were added, removed, renamed or moved, as positions no longer match
+    if [(group_name, len(entries)) for group_name, entries in json_data.items()] != \
+            [(group_name, len(entries)) for group_name, entries in previous.items()]:
+        return None
+
+    # Unlike ==, marshal tells 1 from 1.0 and True and keeps the fields in their order, as the stages and the output do.
+    # Version 0 writes every string the same way, interned or not
+    changed = {}
+    for position, (raw, previous_raw, dump, previous_dump) in enumerate(zip(
+            chain.from_iterable(json_data.values()), chain.from_iterable(previous.values()),
+            map(marshal.dumps, chain.from_iterable(json_data.values()), repeat(0)),
+            map(marshal.dumps, chain.from_iterable(previous.values()), repeat(0)))):
+        if dump != previous_dump:
+            if (raw.get('name'), raw.get('meta', missing)) != (previous_raw.get('name'), previous_raw.get('meta', missing)):
+                return None
+            changed[position] = (raw, previous_raw)
+
+    return changed
+
+
+def reuse_resolved_entries(groups, graph, previous_graph, changed, json_data):
+    # Like restore_unchanged_entries(), from the graph of the previous run kept in memory, e.g. by a watch, for the same
+    # entries in the same order. [graph] is [previous_graph] itself when the entries are linked the same way, otherwise
+    # the one rebuilt for [json_data] (see FoodParser.update()). Resolved entries are taken over from [previous_graph]
+    # unless they or one they depend on changed or are linked differently, those are read again from [json_data]
+    entries = graph['entries']
+    previous_entries = previous_graph['entries']
+    invalidated = set(changed)
+    if graph is not previous_graph:
+        for category in categories:
+            fallbacks = graph['fallbacks'][category]
+            previous_fallbacks = previous_graph['fallbacks'][category]
+            for index, (ingredients, previous_ingredients) in enumerate(zip(graph[category], previous_graph[category])):
+                if ingredients != previous_ingredients or fallbacks.get(index) != previous_fallbacks.get(index):
+                    invalidated.add(index)
+        for name in ('group_cycles', 'written_only', 'saturation_sources'):
+            invalidated.update(index for index in graph[name].keys() | previous_graph[name].keys()
+                               if graph[name].get(index) != previous_graph[name].get(index))
+
+    dependents = get_dependents(graph)
+    pending = deque(invalidated)
+    while pending:
+        for dependent in dependents[pending.popleft()]:
+            if dependent not in invalidated:
+                invalidated.add(dependent)
+                pending.append(dependent)
+
+    if graph is previous_graph:
+        raw_entries = list(chain.from_iterable(json_data.values()))
+        for index in invalidated:
+            entries[index].update(raw_entries[index])
+            graph['conversion_cycles'].pop(index, None)
+            if index in changed and index in graph['written_groups']:
+                graph['written_groups'][index] = list(entries[index].food_groups)
+    else:
+        # Only the entries that changed are hashed again
+        graph['keys'] = previous_graph['keys']
+        graph['hashes'] = list(previous_graph['hashes'])
+        for index, entry in enumerate(previous_entries):
+            if index not in invalidated:
+                entries[index] = entry
+                if index in previous_graph['conversion_cycles']:
+                    graph['conversion_cycles'][index] = previous_graph['conversion_cycles'][index]
+        # The index and the groups refer to the same entries
+        position = 0
+        for group_entries in groups.values():
+            group_entries[:] = entries[position:position + len(group_entries)]
+            position += len(group_entries)
+
+    for index in changed:
+        graph['hashes'][index] = hash_entry(entries[index])
+
+    graph['restored'] = set(range(len(entries))) - invalidated
+    logger.info('Reusing %d entries, recomputing %d entries.', len(graph['restored']), len(invalidated))
+
+
+def get_saturation_sources(graph, index):
+    sources = graph['saturation_sources'].get(index)
+    return None if sources is None else [[graph['keys'][target] for target in targets] for targets in sources]
+
+
+def get_state(graph, config):
+    return {
+        'config': config.get_hash(),
+        'entries': [
+            {
+                'key': key,
+                'name': entry.name,
+                'hash': entry_hash,
+                'conversionCycle': graph['conversion_cycles'].get(index),
+                'groupsCycle': graph['group_cycles'].get(index),
+                'saturationSources': get_saturation_sources(graph, index),
+                'resolved': entry.to_dict()
+            }
+            for index, (key, entry_hash, entry) in enumerate(zip(graph['keys'], graph['hashes'], graph['entries']))
+        ]
+    }
+
+
+def save_state(output_root, graph, config, report=None):
+    write_output(os.path.join(output_root, ''), state_title, json.dumps(get_state(graph, config)), report)
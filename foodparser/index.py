@@ -0,0 +1,65 @@
+from collections import defaultdict
+
+from .entry import missing
+from .items import parse_item_key
+
+
+class FoodIndex:
+    # Lookup index over every entry of a pack, positions follow file order.
+    # Entries are indexed by reference, so values finalized in place are always visible through the index
+
+    def __init__(self, groups=None):
+        self.entries = []
+        # Position of the group of each entry in the pack, e.g. 0 for "foods" and 1 for "ingredients"
+        self.groups = []
+        self.names = defaultdict(list)
+        self.keys = defaultdict(list)
+
+        # Lookups that found at least one entry, and those that found none
+        self.hits = 0
+        self.misses = 0
+
+        for group, entries in enumerate((groups or {}).values()):
+            for entry in entries:
+                self.add(entry, group)
+
+    def add(self, entry, group=0):
+        position = len(self.entries)
+        self.entries.append(entry)
+        self.groups.append(group)
+
+        # "modID:name" for any meta, ("modID:name", meta) for an exact one. Entries without meta are kept under None
+        self.names[entry.name].append(position)
+        self.keys[(entry.name, None if entry.meta is missing else entry.meta)].append(position)
+
+        return position
+
+    def find_entries(self, food_name, food_meta):
+        # Entries with a Metadata have to match our target's, entries without one only match targets without one
+        positions = self.keys.get((food_name, food_meta), [])
+
+        unspecified = self.keys.get((food_name, None))
+        if unspecified and not (isinstance(food_meta, int) and food_meta > 0):
+            positions = sorted(positions + unspecified)
+
+        self.count(positions)
+        return positions
+
+    def find_named(self, food_name):
+        # Every entry named [food_name], whatever its meta
+        positions = self.names.get(food_name, [])
+
+        self.count(positions)
+        return positions
+
+    def find_item(self, ingredient):
+        # Entries a hunger ingredient refers to: any meta for "modID:name", only the given one for "modID:name:meta"
+        if ingredient.count(':') == 2:
+            return self.find_entries(*parse_item_key(ingredient))
+        return self.find_named(ingredient)
+
+    def count(self, positions):
+        if positions:
+            self.hits += 1
+        else:
+            self.misses += 1
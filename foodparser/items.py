@@ -0,0 +1,84 @@
+import logging
+import sys
+from functools import lru_cache
+
+logger = logging.getLogger('FoodParser')
+
+# Ingredient strings parsed most recently, each distinct one is usually split once per run
+key_cache_size = 1 << 16
+
+
+@lru_cache(maxsize=key_cache_size)
+def parse_item_key(food):
+    # ("modID:name", meta) of an ingredient, meta being 0 when not given. Numerical metas are converted to int, as
+    # the "meta" field of entries is, so that both compare equal
+    parts = food.split(":")
+
+    # Can be split in 3 parts using ":" (aka contains modID:name:meta)
+    if len(parts) == 3:
+        meta = parts[2]
+        return sys.intern(f"{parts[0]}:{parts[1]}"), int(meta) if meta.lstrip("-").isdigit() else sys.intern(meta)
+    return sys.intern(food), 0
+
+
+def get_food_name(food):
+    return parse_item_key(food)[0]
+
+
+def get_food_meta(food):
+    return parse_item_key(food)[1]
+
+
+@lru_cache(maxsize=key_cache_size)
+def get_group_key(ingredient):
+    # "modID:name:meta" the food groups of [ingredient] are registered under
+    entry_parts = ingredient.count(":") + 1
+
+    if entry_parts == 3:
+        # Entry contains "modID:name:meta"
+        return sys.intern(ingredient)
+    if entry_parts == 2:
+        # Entry contains "modID:name" but it is missing "meta"
+        return sys.intern(ingredient + ":" + str(0))
+    raise KeyError(
+        logger.error('"hunger" list contains invalid entry: %s', ingredient)
+    )
+
+
+def is_item_key(ingredient):
+    # "modID:name" or "modID:name:meta", any other string cannot refer to an entry
+    return 1 <= ingredient.count(":") <= 2
+
+
+def get_item_key(item):
+    # "modID:name:meta" of an item given on the command line, "modID:name" standing for meta 0 as in recipes
+    return item if item.count(":") >= 2 else f"{item}:0"
+
+
+def initiate_food_group_list_from_ingredients(ingredients):
+    # Malformed ingredients are kept as they are, graph.validate_dependency_graph() reports them
+    return [get_group_key(entry) if is_item_key(entry) else entry for entry in ingredients]
+
+
+def is_conversion_complete(entries, category):
+    for entry in entries:
+        value, resolved = (entry.hunger, entry.hunger_resolved) if category == 'hunger' else (entry.saturation, entry.saturation_resolved)
+        if resolved:
+            continue
+
+        if isinstance(value, list):
+            if any(isinstance(element, str) for element in value):
+
+                logger.info('Entry value for "%s" contains unconverted values.', entry.name)
+                missing_values = [item for item in value if isinstance(item, str)]
+                logger.info('"Unconverted values:" = %s', missing_values)
+
+            else:
+                logger.info('Entry values found for "%s" have not yet been merged.', entry.name)
+
+        else:
+            logger.info('Entry value for [%s] is not a number.', entry.name)
+            logger.info('Value = %s', value)
+
+        return False
+    return True
@@ -0,0 +1,50 @@
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+logger = logging.getLogger('FoodParser')
+
+# Per-entry messages are logged at DEBUG, stage summaries at INFO and unresolvable ingredients at WARNING
+log_level = 'DEBUG'
+log_file = 'logs.info'
+
+
+# Background thread of --log-queue, replaced along with the handlers when logging is set up again
+listener = None
+
+
+def stop_listener():
+    global listener
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+        listener = None
+
+
+def setup_logging(level=log_level, filename=log_file, use_queue=False):
+    # May be called again, the handlers of the previous call are closed first
+    global listener
+    stop_listener()
+    logger.disabled = level == 'OFF'
+    if level == 'OFF':
+        logging.basicConfig(handlers=[logging.NullHandler()], force=True)
+        return
+
+    # Every run starts a new log
+    handler = logging.FileHandler(filename, mode='w')
+    handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+
+    if use_queue:
+        # Records are handed over to a background thread which does the file writes
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, handler)
+        listener.start()
+        atexit.unregister(stop_listener)
+        atexit.register(stop_listener)
+        handler = QueueHandler(log_queue)
+        # Records are formatted by the file handler, the queue only merges their arguments into the message
+        handler.setFormatter(logging.Formatter('%(message)s'))
+
+    logging.basicConfig(level=level, handlers=[handler], force=True)
@@ -0,0 +1,224 @@
+import gzip
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from .entry import Entry, missing
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Values the C encoder writes the same with or without indentation
+scalar_types = {str, int, float, bool, type(None)}
+
+# Fields left out of Food Values.json
+entries_to_delete = ['foodGroups', 'hungerModifier', 'appendGroups', 'removeGroups', 'componentItems', 'componentSaturations', 'type']
+
+
+class Serializer:
+    # Encodes the output files. 'json' writes them exactly as before, 'orjson' is several times faster but indents by
+    # 2 spaces and keeps non-ASCII characters unescaped. 'auto' uses orjson when it is installed
+
+    def __init__(self, name='auto'):
+        if name == 'auto':
+            name = 'json' if orjson is None else 'orjson'
+        if name == 'orjson' and orjson is None:
+            raise ImportError('The orjson serializer requires orjson')
+
+        self.name = name
+        self.indent = 2 if name == 'orjson' else 4
+        # Entries are encoded one at a time, the encoders are only created once
+        self.encoders = {True: json.JSONEncoder(indent=self.indent, default=encode_entry), False: json.JSONEncoder(default=encode_entry)}
+        self.list_encoder = json.JSONEncoder(separators=(',\n' + ' ' * self.indent * 2, ': '))
+
+    def dumps(self, value, indent=True):
+        if self.name == 'orjson':
+            return orjson.dumps(value, default=encode_entry, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+        return self.encoders[indent].encode(value)
+
+    def dumps_entry(self, raw):
+        # Same text as dumps(raw). Indented output goes through json's pure-Python encoder, entries being flat records
+        # their scalars and lists of scalars are encoded by the C encoder instead, the indentation given as separators
+        if self.name == 'orjson':
+            return self.dumps(raw)
+        if not raw:
+            return '{}'
+
+        unit = ' ' * self.indent
+        fields = []
+        for field, value in raw.items():
+            if type(value) is list and value and all(type(element) in scalar_types for element in value):
+                text = f'[\n{unit * 2}{self.list_encoder.encode(value)[1:-1]}\n{unit}]'
+            elif type(value) in scalar_types:
+                text = self.encoders[False].encode(value)
+            else:
+                text = self.dumps(value).replace('\n', '\n' + unit)
+            fields.append(f'{unit}{self.encoders[False].encode(field)}: {text}')
+
+        return '{\n' + ',\n'.join(fields) + '\n}'
+
+    def dumps_lists(self, lists):
+        # Same text as dumps({name: [values]}) from the values already encoded one by one with dumps()
+        if not lists:
+            return '{}'
+
+        unit = ' ' * self.indent
+        parts = []
+        for name, texts in lists.items():
+            if texts:
+                values = (',\n' + unit * 2).join(text.replace('\n', '\n' + unit * 2) for text in texts)
+                parts.append(f'{unit}{self.dumps(name)}: [\n{unit * 2}{values}\n{unit}]')
+            else:
+                parts.append(f'{unit}{self.dumps(name)}: []')
+
+        return '{\n' + ',\n'.join(parts) + '\n}'
+
+
+def export_food_groups(groups, output_root='./output', report=None, compact=False, serializer=None):
+    serializer = serializer or Serializer('json')
+    colors = {
+        "Beverages": "dark_aqua",
+        "Dairy": "white",
+        "Seafood": "aqua",
+        "Fruits": "dark_blue",
+        "Fungi": "light_purple",
+        "Grains": "yellow",
+        "Legumes": "red",
+        "Meats": "dark_red",
+        "Nuts": "dark_gray",
+        "Sweets": "gold",
+        "Vegetables": "green",
+        "Herbs & Spices": "dark_green",
+    }
+
+    # Items of every food group, collected in a single pass over the foods
+    group_items = {}
+    for entry in groups['foods']:
+        item = None
+        for food_group in dict.fromkeys(entry.food_groups):
+            if food_group != 'None':
+                if item is None:
+                    item = entry.name if entry.meta == 0 or entry.meta is missing else f"{entry.name}:{entry.meta}"
+                group_items.setdefault(food_group, []).append(item)
+
+    directory = os.path.join(output_root, 'SpiceOfLife', '')
+    if not group_items:
+        return
+
+    # Checks if output folder exists, else attempts to create one
+    try:
+        os.makedirs(directory, exist_ok=True)
+    except Exception as e:
+        print(f"An error occurred: {e}")
+
+    def write_group(food_group):
+        group_json = {
+            "food": {
+                "items": group_items[food_group]
+            },
+            "name": food_group,
+            "color": colors[food_group] if colors.get(food_group) is not None else ""
+        }
+        return write_output(directory, food_group + ".json", serializer.dumps(group_json, indent=not compact), report)
+
+    # saves data in the output folder, the files being independent they are written side by side
+    with ThreadPoolExecutor() as executor:
+        list(executor.map(write_group, group_items))
+
+
+# Cleans up json file from unnecessary fields and entries
+def clean_data(groups):
+    return {'foods': [entry.to_dict(entries_to_delete) for entry in groups.get('foods', [])]}
+
+
+def get_output_directory(output_root):
+    directory = os.path.join(output_root, 'HungerOverhaul', '')
+
+    # Checks if output folder exists, else attempts to create one
+    try:
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+    except Exception as e:
+        print(f"An error occurred: {e}")
+
+    return directory
+
+
+# Save new Json data
+def output_data(json_file, title, output_root='./output', report=None, serializer=None):
+    # saves data in the output folder
+    write_output(get_output_directory(output_root), title, (serializer or Serializer('json')).dumps(json_file), report)
+
+
+def output_food_values(groups, output_root='./output', report=None, serializer=None, compress_debug=False):
+    # Writes DEBUG-Food Values.json and Food Values.json from a single pass over the entries.
+    # Each entry is converted and encoded once for both files, the clean one only leaving fields out
+    serializer = serializer or Serializer('json')
+    debug = {}
+    clean = []
+    for group_name, entries in groups.items():
+        debug[group_name] = []
+        for entry in entries:
+            raw = entry.to_dict()
+            debug[group_name].append(serializer.dumps_entry(raw))
+            if group_name == 'foods':
+                clean.append(serializer.dumps_entry({field: value for field, value in raw.items() if field not in entries_to_delete}))
+
+    directory = get_output_directory(output_root)
+    debug_content = serializer.dumps_lists(debug)
+    if compress_debug:
+        # Fixed timestamp, so that an unchanged dump gives the same file
+        write_output(directory, 'DEBUG-Food Values.json.gz', gzip.compress(debug_content.encode(), compresslevel=6, mtime=0), report)
+    else:
+        write_output(directory, 'DEBUG-Food Values.json', debug_content, report)
+    write_output(directory, 'Food Values.json', serializer.dumps_lists({'foods': clean}), report)
+
+
+def encode_entry(value):
+    # Entries are converted one at a time while encoding, so the whole pack never exists as dicts
+    if isinstance(value, Entry):
+        return value.to_dict()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def is_unchanged(path, content, chunk_size=1 << 20):
+    # Compared chunk by chunk, so the previous file is never held in memory next to [content]
+    try:
+        with open(path, 'rb' if isinstance(content, bytes) else 'r') as existing:
+            position = 0
+            while True:
+                chunk = existing.read(chunk_size)
+                if not chunk:
+                    return position == len(content)
+                if content[position:position + len(chunk)] != chunk:
+                    return False
+                position += len(chunk)
+    except OSError:
+        return False
+
+
+def write_output(directory, title, content, report=None):
+    # Leaves files whose contents did not change untouched
+    if is_unchanged(directory + title, content):
+        if report is not None:
+            report.count('files_unchanged')
+        return False
+
+    # Written next to its destination then renamed over it, an interrupted run never leaves a truncated file
+    temporary = f'{directory}.{title}.tmp'
+    try:
+        with open(temporary, 'wb' if isinstance(content, bytes) else 'w') as output:
+            output.write(content)
+        os.replace(temporary, directory + title)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+    if report is not None:
+        report.count('files_written')
+        report.count('bytes_written', len(content if isinstance(content, bytes) else content.encode()))
+
+    return True
@@ -0,0 +1,111 @@
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import traceback
+
+from timeit import default_timer as timer
+
+from .__main__ import get_argument_parser, run
+from .config import Config, load_config
+from .logs import log_level, setup_logging
+
+# Runs several modpack variants at once, e.g. packs.json:
+# [
+#     {"name": "base", "input": "base/Raw_FoodValues.json"},
+#     {"name": "hard", "input": "hard/Raw_FoodValues.json", "config": {"base_saturation": 0.1, "bonus_smelting": 1}},
+#     {"name": "easy", "input": "easy/Raw_FoodValues.json", "config": "easy/config.json"}
+# ]
+# Each pack is written to its own output folder (default: ./output/<name>), with its own logs.info, report.json
+# and statistics.json
+
+
+def read_packs(filename, output_root='./output'):
+    with open(filename, 'r') as f:
+        packs = json.load(f)
+
+    names = set()
+    for pack in packs:
+        if 'input' not in pack:
+            raise ValueError(f'Pack {pack} has no "input" file')
+        pack.setdefault('name', os.path.basename(os.path.dirname(os.path.abspath(pack['input']))))
+        if pack['name'] in names:
+            raise ValueError(f'Pack name "{pack["name"]}" is used more than once, packs need their own output folder')
+        names.add(pack['name'])
+        pack.setdefault('output', os.path.join(output_root, pack['name']))
+        pack.setdefault('config', {})
+
+    return packs
+
+
+def run_pack(pack, options):
+    # Runs in a worker process of its own, nothing is shared with the other packs
+    start = timer()
+    try:
+        config = load_config(pack['config']) if isinstance(pack['config'], str) else Config().replace(pack['config'])
+        os.makedirs(pack['output'], exist_ok=True)
+        arguments = get_argument_parser().parse_args([
+            '--input', pack['input'],
+            '--output', pack['output'],
+            '--log-file', os.path.join(pack['output'], 'logs.info'),
+            '--report', os.path.join(pack['output'], 'report.json'),
+            *options,
+        ])
+        setup_logging(arguments.log_level, arguments.log_file, arguments.log_queue)
+        result = run(arguments, config)
+        statistics = result.get_statistics()
+        with open(os.path.join(pack['output'], 'statistics.json'), 'w') as statistics_output:
+            json.dump(statistics, statistics_output, indent=4)
+        return {'name': pack['name'], 'entries': statistics['entries'], 'seconds': timer() - start}
+    except Exception:
+        return {'name': pack['name'], 'error': traceback.format_exc(), 'seconds': timer() - start}
+
+
+def run_packs(packs, options=(), jobs=None):
+    # One process per pack, a fresh one every time so that logging and caches never carry over
+    with multiprocessing.Pool(jobs or os.cpu_count(), maxtasksperchild=1) as pool:
+        return pool.starmap(run_pack, [(pack, list(options)) for pack in packs], chunksize=1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Processes several Raw_FoodValues.json files in parallel.')
+    parser.add_argument('packs', help='JSON list of packs, each with an "input" file and optional "name", "output" '
+                                      'and "config" (settings or config file)')
+    parser.add_argument('--output', default='./output', help='folder the output folder of every pack is created in (default: ./output)')
+    parser.add_argument('--jobs', type=int, help='number of packs processed at once (default: number of cores)')
+    parser.add_argument('--stream', action='store_true', help='read the inputs one entry at a time')
+    parser.add_argument('--batch', action='store_true', help='compute hunger and saturation values with NumPy')
+    parser.add_argument('--compact', action='store_true', help='write the SpiceOfLife group files without indentation')
+    parser.add_argument('--incremental', action='store_true', help='reuse the results of the previous run of every pack')
+    parser.add_argument('--serializer', default='auto', choices=['auto', 'json', 'orjson'], help='JSON encoder of the output files')
+    parser.add_argument('--gzip-debug', action='store_true', help='write the debug dumps compressed')
+    parser.add_argument('--snapshot', action='store_true', help='also write the binary Food Values.bin of every pack')
+    parser.add_argument('--cache', help='SQLite file of resolved entries shared by the packs, see python -m foodparser.cachetool')
+    parser.add_argument('--log-level', default=log_level, choices=['DEBUG', 'INFO', 'WARNING', 'ERROR', 'OFF'],
+                        help=f'minimum level written to the logs (default: {log_level})')
+    arguments = parser.parse_args(argv)
+
+    options = ['--log-level', arguments.log_level] + (['--cache', arguments.cache] if arguments.cache else [])
+    options += ['--serializer', arguments.serializer]
+    options += [f'--{option.replace("_", "-")}' for option in ('stream', 'batch', 'compact', 'incremental', 'gzip_debug', 'snapshot')
+                if getattr(arguments, option)]
+
+    start = timer()
+    results = run_packs(read_packs(arguments.packs, arguments.output), options, arguments.jobs)
+
+    failed = 0
+    for result in results:
+        if 'error' in result:
+            failed += 1
+            print(f'{result["name"]}: failed after {round(result["seconds"], 3)} seconds')
+            print(result['error'])
+        else:
+            print(f'{result["name"]}: processed {result["entries"]} food entries in {round(result["seconds"], 3)} seconds')
+
+    print(f'Completed {len(results) - failed} of {len(results)} packs in {round(timer() - start, 3)} seconds')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,189 @@
+import logging
+from collections import Counter
+from dataclasses import dataclass
+
+from .cache import restore_cached_entries, store_resolved_entries
+from .config import Config
+from .entry import Entry, read_entries
+from .food_groups import process_food_groups
+from .graph import build_dependency_graph, get_entry_shape, validate_dependency_graph
+from .hunger import process_hunger_entries
+from .incremental import find_changed_entries, get_state, hash_entries, restore_unchanged_entries, reuse_resolved_entries
+from .index import FoodIndex
+from .output import clean_data
+from .report import RunReport
+from .saturation import process_saturation_entries, sanitize_saturation_entries
+from .statistics import count_entries, get_number_foods_per_quality, get_statistics, get_total_food_points
+
+logger = logging.getLogger('FoodParser')
+
+
+@dataclass
+class ParseResult:
+    # Resolved entries of each group of Raw_FoodValues.json
+    groups: dict
+    graph: dict
+    config: Config
+    report: RunReport
+
+    @property
+    def data(self):
+        # Resolved Raw_FoodValues.json, including the debug fields. Built on every access
+        return {group_name: [entry.to_dict() for entry in entries] for group_name, entries in self.groups.items()}
+
+    def get_food_values(self):
+        return clean_data(self.groups)
+
+    def get_state(self):
+        # Only available when parsing with incremental=True
+        return get_state(self.graph, self.config)
+
+    def count_entries(self):
+        return count_entries(self.groups)
+
+    def get_total_food_points(self):
+        return get_total_food_points(self.groups)
+
+    def get_number_foods_per_quality(self, index):
+        return get_number_foods_per_quality(self.groups, index, self.config.quality_thresholds)
+
+    def get_statistics(self):
+        # Totals, quality histogram, per-group, per-mod and hunger distribution figures, see statistics.get_statistics()
+        return get_statistics(self.groups, self.config.quality_thresholds)
+
+
+class FoodParser:
+    # Resolves the values of a parsed Raw_FoodValues.json. Keeps no state between runs, so one instance can parse any number of packs.
+    # With batch=True, hunger and saturation values are computed over NumPy arrays, with identical results.
+    # With a cache.ValueCache, entries resolved by earlier runs of any pack are reused and new ones are added to it
+
+    def __init__(self, config=None, batch=False, cache=None):
+        # The batch engine, and NumPy with it, is only imported when used
+        self.batch_engine = None
+        if batch:
+            from . import batch as batch_engine
+            if batch_engine.numpy is None:
+                raise ImportError('The batch engine requires NumPy')
+            self.batch_engine = batch_engine
+
+        self.config = config or Config()
+        self.batch = batch
+        self.cache = cache
+
+    def parse(self, json_data, incremental=False, state=None, report=None):
+        # [json_data] is left untouched
+        return self.resolve(read_entries(json_data), incremental, state, report)
+
+    def resolve(self, groups, incremental=False, state=None, report=None):
+        # Resolves the entries of [groups], as returned by entry.read_entries(), in place
+        report = report or RunReport()
+        graph = self.build_graph(groups, incremental, report)
+        self.check_problems(graph)
+
+        if incremental and state is not None:
+            with report.stage('restore') as stage:
+                restore_unchanged_entries(graph, state)
+                stage['restored'] = len(graph['restored'])
+
+        return self.resolve_remaining(groups, graph, report)
+
+    def update(self, result, previous, json_data, report=None):
+        # Resolves [json_data] again from [result], the ParseResult of an incremental run of [previous], an earlier version
+        # of the same pack, with the same config. Only the entries that changed and those depending on them are resolved
+        # again, and the graph is only rebuilt when entries changed shape (see graph.get_entry_shape()). The entries of
+        # [result] are reused, it is left out of date. Returns None when entries were added, removed, renamed or moved,
+        # which takes a full run
+        report = report or RunReport()
+        groups = result.groups
+        graph = result.graph
+
+        with report.stage('graph') as stage:
+            changed = find_changed_entries(previous, json_data)
+            if changed is None:
+                logger.info('Entries were added, removed or moved since the last run, rebuilding everything.')
+                return None
+            stage['changed'] = len(changed)
+            reshaped = any(get_entry_shape(Entry(raw)) != get_entry_shape(Entry(previous_raw))
+                           for raw, previous_raw in changed.values())
+
+        if reshaped:
+            groups = read_entries(json_data)
+            graph = self.build_graph(groups, report=report)
+        self.check_problems(graph)
+
+        with report.stage('restore') as stage:
+            reuse_resolved_entries(groups, graph, result.graph, changed, json_data)
+            stage['restored'] = len(graph['restored'])
+
+        return self.resolve_remaining(groups, graph, report)
+
+    def resolve_remaining(self, groups, graph, report):
+        # Resolves the entries of [graph] which were not restored, from the cache when there is one
+        if self.cache is None:
+            return self.resolve_values(groups, graph, report)
+
+        with report.stage('cache') as stage:
+            stage['cached'] = restore_cached_entries(graph, self.cache, self.config)
+
+        result = self.resolve_values(groups, graph, report)
+
+        with report.stage('cache') as stage:
+            stage['stored'] = store_resolved_entries(graph, self.cache)
+
+        return result
+
+    def build_graph(self, groups, incremental=False, report=None):
+        # Dependency graph of [groups], the same for every config. Problems found are left to check_problems()
+        report = report or RunReport()
+
+        with report.stage('graph') as stage:
+            index = FoodIndex(groups)
+            graph = build_dependency_graph(index)
+            stage['entries'] = len(graph['entries'])
+            # The index is created within the stage, so all of its lookups so far were made building the graph
+            stage['index_hits'] = stage.get('index_hits', 0) + index.hits
+            stage['index_misses'] = stage.get('index_misses', 0) + index.misses
+
+            if incremental:
+                hash_entries(graph, groups)
+
+        with report.stage('validate', index) as stage:
+            graph['problems'] = validate_dependency_graph(graph)
+            stage['problems'] = len(graph['problems'])
+
+        return graph
+
+    def check_problems(self, graph):
+        # Raises when ingredients cannot be resolved and the config has no stand-in values for them
+        problems = graph['problems']
+        if problems:
+            for problem in problems:
+                logger.warning(problem)
+
+            if self.config.unresolved_ingredient is None:
+                raise ValueError(f'Found {len(problems)} unresolvable ingredients:\n' + '\n'.join(problems))
+
+            logger.warning('Using %s for %d unresolvable ingredients.', self.config.unresolved_ingredient, len(problems))
+
+    def resolve_values(self, groups, graph, report=None):
+        # Food groups, saturation and hunger values of the entries of [graph], the part of a run that depends on the config
+        report = report or RunReport()
+        index = graph['index']
+
+        with report.stage('food_groups', index) as stage:
+            stage['processed'] = process_food_groups(graph, self.config)
+
+        with report.stage('saturation', index) as stage:
+            sanitize_saturation_entries(graph['entries'], self.config)
+            process = self.batch_engine.process_saturation_entries_batch if self.batch else process_saturation_entries
+            stage['processed'] = process(graph, self.config)
+
+        with report.stage('hunger', index) as stage:
+            process = self.batch_engine.process_hunger_entries_batch if self.batch else process_hunger_entries
+            stage['processed'] = process(graph, self.config)
+
+            # Entries per cycle of the former fixed-point loop, -1 for entries which were numerical from the start
+            cycles = Counter(graph['conversion_cycles'].values())
+            stage['entries_per_cycle'] = {str(cycle): cycles[cycle] for cycle in sorted(cycles)}
+
+        return ParseResult(groups, graph, self.config, report)
@@ -0,0 +1,50 @@
+import json
+import threading
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+
+from timeit import default_timer as timer
+
+
+class RunReport:
+    # Wall time and counters of every stage of a run, peak memory too when tracemalloc is tracing
+
+    def __init__(self):
+        self.stages = {}
+        self.counters = defaultdict(int)
+        self.lock = threading.Lock()
+        self.start = timer()
+
+    @contextmanager
+    def stage(self, name, index=None):
+        stage = self.stages.setdefault(name, {'seconds': 0.0})
+        if index is not None:
+            hits, misses = index.hits, index.misses
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+
+        start = timer()
+        try:
+            yield stage
+        finally:
+            stage['seconds'] += timer() - start
+            if index is not None:
+                stage['index_hits'] = stage.get('index_hits', 0) + index.hits - hits
+                stage['index_misses'] = stage.get('index_misses', 0) + index.misses - misses
+            if tracemalloc.is_tracing():
+                stage['peak_memory'] = max(stage.get('peak_memory', 0), tracemalloc.get_traced_memory()[1])
+
+    def count(self, name, amount=1):
+        # Files are written from several threads
+        with self.lock:
+            self.counters[name] += amount
+
+    def get_report(self):
+        report = {'seconds': timer() - self.start, 'stages': self.stages, 'counters': dict(self.counters)}
+        if tracemalloc.is_tracing():
+            report['peak_memory'] = tracemalloc.get_traced_memory()[1]
+        return report
+
+    def to_json(self):
+        return json.dumps(self.get_report(), indent=4)
@@ -0,0 +1,152 @@
+import logging
+
+from .entry import missing
+from .graph import topological_order
+from .items import is_conversion_complete, parse_item_key
+
+logger = logging.getLogger('FoodParser')
+
+
+def retrieve_saturation_score(index, food_name, food_meta, config, positions=None):
+    # [positions] are the entries the dependency graph links the ingredient to, see graph.find_dependencies()
+    if isinstance(food_name, str):
+        for position in index.find_entries(food_name, food_meta) if positions is None else positions:
+            entry = index.entries[position]
+            # Entries are processed in dependency order, so a valid target is already resolved
+            if entry.saturation_resolved:
+                return float(max(entry.saturation, config.base_saturation))
+
+            logger.debug('Could not parse %s of %s into numerical value.', entry.saturation, food_name)
+
+    return food_name
+
+
+def convert_list_to_numerical_saturation(index, food_list, config, fallbacks=(), sources=None):
+    # [sources] are the (ingredient, targets) edges of the ingredients of [food_list] which are not in [fallbacks], in order
+    number_list = []
+    for food_entry in food_list:
+        if food_entry in fallbacks:
+            number_list.append(float(config.unresolved_ingredient['saturationModifier']))
+
+        elif isinstance(food_entry, str):
+            # Name entry found.Attempting to retrieve its Saturation Value
+            food_name, food_meta = parse_item_key(food_entry)
+
+            calculated_value = retrieve_saturation_score(index, food_name, food_meta, config,
+                                                         None if sources is None else next(sources)[1])
+            if isinstance(calculated_value, float):
+                # Successfully converted Food Entry into saturation score
+                number_list.append(calculated_value)
+
+            else:
+                # Failed to convert Food Entry into saturation score. We'll try again later.
+                number_list.append(food_entry)
+
+        elif isinstance(food_entry, float):
+            # Entry is already converted into numerical value
+            number_list.append(food_entry)
+
+        else:
+            raise KeyError(
+                logger.error('"foodGroups" Attempted to convert food list with an invalid list.'),
+                logger.error("Errored entry: %s in %s", food_entry, food_list)
+            )
+
+
+    return number_list
+
+
+def finalize_saturation_score(entry, config):
+    Bonus = config.bonus_saturation
+
+    # For Debug Purposes
+    entry.component_saturations = entry.saturation
+    #####
+
+    # Top Saturation Score in list
+    top_score = max(entry.saturation)
+
+    final_score = max(top_score, config.base_saturation)
+
+    # Factor in Minimum Saturation and Saturation Bonuses
+    if entry.type is not missing and entry.type in config.incompatible_with_saturation_bonus:
+        Bonus = 0
+    else:
+        if final_score < config.low_saturation_threshold:
+            Bonus = config.low_saturation_bonus
+
+    entry.saturation = float(round(final_score + Bonus, 1))
+    entry.saturation_resolved = True
+
+
+def sanitize_saturation_entries(entries, config):
+    for entry in entries:
+        if entry.saturation is missing:
+
+            # Entry does not have a SaturationModifier prepared.
+            if entry.hunger is not missing:
+
+                # Compute [saturationModifier] from ingredient list in [hunger]
+                if isinstance(entry.hunger, list):
+                    entry.saturation = entry.hunger
+
+                    # Debug Entry Things - ignore
+                    entry.component_items = entry.hunger
+
+                else:
+                    # SaturationModifier set to default
+                    entry.saturation = config.base_saturation
+                    entry.saturation_resolved = isinstance(entry.saturation, float)
+
+
+def process_saturation_entries(graph, config):
+    processed_entries_saturation = 0
+    debug = logger.isEnabledFor(logging.DEBUG)
+
+    for index in topological_order(graph, 'saturationModifier'):
+        if index in graph['restored']:
+            continue
+
+        entry = graph['entries'][index]
+        if entry.saturation_resolved:
+            continue
+
+        # Found manually compiled numerical entry without decimal. We'll use that
+        if isinstance(entry.saturation, int):
+            entry.saturation = float(entry.saturation)
+            entry.saturation_resolved = True
+
+        # Found an instance of 'saturationModifier' in an inconverted state
+        elif isinstance(entry.saturation, list):
+            if debug:
+                logger.debug("Found List: %s", entry.saturation)
+
+            # Every ingredient has already been finalized, so a single conversion is enough
+            if not all(isinstance(element, float) for element in entry.saturation):
+                entry.saturation = convert_list_to_numerical_saturation(
+                    graph['index'], entry.saturation, config,
+                    graph['fallbacks']['saturationModifier'].get(index, ()),
+                    iter(graph['saturationModifier'][index]))
+
+            if all(isinstance(element, float) for element in entry.saturation):
+                # Finalizing ['saturationModifier']
+                finalize_saturation_score(entry, config)
+                if debug:
+                    logger.debug("Successfully processed Entry %s.", entry.name)
+
+                processed_entries_saturation += 1
+            else:
+                logger.info("Incomplete process Entry for %s. Contains: %s.", entry.name, entry.saturation)
+
+        else:
+            logger.info('Found invalid saturationModifier for %s', entry.name)
+            logger.info('Type = %s', type(entry.name))
+
+    logger.info('Processed %d saturation entries.', processed_entries_saturation)
+
+    if is_conversion_complete(graph['entries'], 'saturationModifier'):
+        logger.info('Success!')
+    else:
+        logger.info('Saturation conversion incomplete.')
+
+    return processed_entries_saturation
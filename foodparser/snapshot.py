@@ -0,0 +1,199 @@
+import argparse
+import json
+import math
+import mmap
+import struct
+import sys
+
+from .items import get_item_key
+from .output import get_output_directory, write_output
+
+# Binary copy of the resolved foods for tools that only look a few items up, e.g.
+# python -m foodparser.snapshot "output/HungerOverhaul/Food Values.bin" minecraft:bread --group Grains
+#
+# Little-endian, every section padded with zero bytes to a multiple of 8:
+#   header        magic, version, number of foods, number of food groups, then the offset of every section
+#   group names   JSON list of the food groups, bit i of a mask standing for the i-th one
+#   key offsets   uint32 per food + 1, start of each key in the key blob
+#   key blob      UTF-8 "modID:name:meta" keys, sorted bytewise, foods are stored in that order
+#   hunger        int32 per food, missing_hunger when the food has no numerical value
+#   saturation    float64 per food, NaN when the food has no numerical value
+#   masks         uint64 food group mask per food
+#   group offsets uint32 per food group + 1, start of each group's foods in the group rows
+#   group rows    uint32 positions of the foods of every group, sorted
+
+snapshot_title = 'Food Values.bin'
+magic = b'FPSNAP\x00\x00'
+version = 1
+header = struct.Struct('<8sIII4x9Q')
+missing_hunger = -2 ** 31
+
+
+def pack_array(code, values):
+    return struct.pack(f'<{len(values)}{code}', *values)
+
+
+def build_snapshot(groups):
+    # Bytes of the snapshot of the foods of [groups]. Food groups are stored as a mask, so they read back sorted and
+    # without duplicates
+    foods = sorted(groups.get('foods', []), key=lambda entry: entry.key.encode())
+    names = sorted({group for entry in foods if isinstance(entry.food_groups, list) for group in entry.food_groups})
+    if len(names) > 64:
+        raise ValueError(f'Snapshots hold up to 64 food groups, found {len(names)}')
+    bits = {name: 1 << bit for bit, name in enumerate(names)}
+
+    keys = [entry.key.encode() for entry in foods]
+    key_offsets = [0]
+    for key in keys:
+        key_offsets.append(key_offsets[-1] + len(key))
+
+    hunger = []
+    saturation = []
+    masks = []
+    rows = [[] for _ in names]
+    for position, entry in enumerate(foods):
+        hunger.append(entry.hunger if type(entry.hunger) is int else missing_hunger)
+        saturation.append(float(entry.saturation) if type(entry.saturation) in (int, float) else math.nan)
+
+        mask = 0
+        if isinstance(entry.food_groups, list):
+            for group in entry.food_groups:
+                mask |= bits[group]
+        masks.append(mask)
+        for bit in range(len(names)):
+            if mask >> bit & 1:
+                rows[bit].append(position)
+
+    group_offsets = [0]
+    for group_rows in rows:
+        group_offsets.append(group_offsets[-1] + len(group_rows))
+
+    sections = [
+        json.dumps(names).encode(),
+        pack_array('I', key_offsets),
+        b''.join(keys),
+        pack_array('i', hunger),
+        pack_array('d', saturation),
+        pack_array('Q', masks),
+        pack_array('I', group_offsets),
+        pack_array('I', [position for group_rows in rows for position in group_rows]),
+    ]
+
+    offsets = []
+    content = bytearray(header.size)
+    for section in sections:
+        content += bytes(-len(content) % 8)
+        offsets.append(len(content))
+        content += section
+    offsets.append(len(content))
+
+    header.pack_into(content, 0, magic, version, len(foods), len(names), *offsets)
+    return bytes(content)
+
+
+def output_snapshot(groups, output_root='./output', report=None):
+    # Written next to Food Values.json, which stays the file the game reads
+    write_output(get_output_directory(output_root), snapshot_title, build_snapshot(groups), report)
+
+
+class Snapshot:
+    # Read-only view of a snapshot file. The file is memory-mapped, a lookup only reads the keys its binary search
+    # visits and the values of the foods found
+
+    def __init__(self, filename):
+        with open(filename, 'rb') as snapshot_input:
+            self.map = mmap.mmap(snapshot_input.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            found, found_version, self.count, group_count, *self.offsets = header.unpack_from(self.map, 0)
+        except struct.error:
+            found = None
+        if found != magic or found_version != version:
+            self.map.close()
+            raise ValueError(f'{filename} is not a version {version} food values snapshot')
+
+        self.group_names = json.loads(self.map[self.offsets[0]:self.offsets[1]].rstrip(b'\0'))
+        self.group_bits = {name: bit for bit, name in enumerate(self.group_names)}
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.map.close()
+
+    def get_key(self, position):
+        start, end = struct.unpack_from('<II', self.map, self.offsets[1] + 4 * position)
+        return self.map[self.offsets[2] + start:self.offsets[2] + end]
+
+    def find(self, item):
+        # Positions of the foods registered as [item], "modID:name" standing for meta 0 as in recipes
+        key = get_item_key(item).encode()
+        start, end = 0, self.count
+        while start < end:
+            middle = (start + end) // 2
+            if self.get_key(middle) < key:
+                start = middle + 1
+            else:
+                end = middle
+
+        while end < self.count and self.get_key(end) == key:
+            end += 1
+        return range(start, end)
+
+    def get_food(self, position):
+        # Values of the food at [position], fields without a numerical value being left out
+        key = self.get_key(position).decode()
+        name, meta = key.rsplit(':', 1)
+        food = {'name': name, 'meta': int(meta) if meta.lstrip('-').isdigit() else meta}
+
+        hunger, = struct.unpack_from('<i', self.map, self.offsets[3] + 4 * position)
+        if hunger != missing_hunger:
+            food['hunger'] = hunger
+        saturation, = struct.unpack_from('<d', self.map, self.offsets[4] + 8 * position)
+        if not math.isnan(saturation):
+            food['saturationModifier'] = saturation
+
+        mask, = struct.unpack_from('<Q', self.map, self.offsets[5] + 8 * position)
+        food['foodGroups'] = [group for bit, group in enumerate(self.group_names) if mask >> bit & 1]
+        return food
+
+    def lookup(self, item):
+        # Every food registered as [item], usually a single one
+        return [self.get_food(position) for position in self.find(item)]
+
+    def get_group(self, group):
+        # Keys of the foods of [group], sorted
+        bit = self.group_bits.get(group)
+        if bit is None:
+            return []
+
+        start, end = struct.unpack_from('<II', self.map, self.offsets[6] + 4 * bit)
+        positions = struct.unpack_from(f'<{end - start}I', self.map, self.offsets[7] + 4 * start)
+        return [self.get_key(position).decode() for position in positions]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Looks foods up in a snapshot written with --snapshot.')
+    parser.add_argument('snapshot', help='snapshot file, e.g. "output/HungerOverhaul/Food Values.bin"')
+    parser.add_argument('items', nargs='*', help='items to look up, e.g. minecraft:bread or minecraft:fish:1')
+    parser.add_argument('--group', action='append', default=[], help='list the foods of this food group')
+    arguments = parser.parse_args(argv)
+
+    with Snapshot(arguments.snapshot) as snapshot:
+        found = {item: snapshot.lookup(item) for item in arguments.items}
+        found.update({group: snapshot.get_group(group) for group in arguments.group})
+        if not arguments.items and not arguments.group:
+            found = {'foods': len(snapshot), 'foodGroups': snapshot.group_names}
+
+    print(json.dumps(found, indent=4))
+    return 0 if all(found.values()) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
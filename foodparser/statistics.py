@@ -0,0 +1,99 @@
+import bisect
+import math
+from collections import Counter
+
+quality_names = ['Poor', 'Low', 'Normal', 'Good', 'Great']
+
+
+def count_entries(groups):
+    return len(groups.get('foods', [])) + len(groups.get('ingredients', []))
+
+
+def get_quality_name(index):
+    return quality_names[index] if index < len(quality_names) else f'Quality {index}'
+
+
+def get_quality_labels(thresholds):
+    # 'Poor Foods (<0.6)', ..., 'Great Foods (+2.4)', one per bucket between the thresholds
+    bounds = [f'<{threshold}' for threshold in thresholds] + [f'+{thresholds[-1]}' if thresholds else 'all']
+    return [f'{get_quality_name(index)} Foods ({bound})' for index, bound in enumerate(bounds)]
+
+
+def get_total_food_points(groups):
+    total_foodpoints = 0
+
+    for entry in groups['foods']:
+        total_foodpoints += entry.hunger
+
+    return total_foodpoints
+
+
+def get_number_foods_per_quality(groups, index, thresholds=(0.6, 1.2, 1.8, 2.4)):
+    # Foods of quality [index], between the bounds of Config.quality_thresholds
+    if index > len(thresholds):
+        return 0
+
+    lower = thresholds[index - 1] if index > 0 else float('-inf')
+    upper = thresholds[index] if index < len(thresholds) else float('inf')
+
+    count = 0
+    for entry in groups['foods']:
+        if upper > entry.saturation >= lower:
+            count += 1
+
+    return count
+
+
+def get_percentile(values, percentile):
+    # Nearest-rank percentile of the sorted [values]
+    if not values:
+        return None
+    return values[max(math.ceil(percentile / 100 * len(values)) - 1, 0)]
+
+
+def get_statistics(groups, thresholds=(0.6, 1.2, 1.8, 2.4), percentiles=(10, 25, 50, 75, 90, 99)):
+    # Every figure of the end-of-run summary, gathered in a single pass over the foods
+    qualities = [0] * (len(thresholds) + 1)
+    group_lists = Counter()
+    mods = Counter()
+    hunger_values = []
+    total_food_points = 0
+    unresolved = 0
+
+    for entry in groups.get('foods', []):
+        mods[entry.name.partition(':')[0]] += 1
+        if isinstance(entry.food_groups, list):
+            # Foods share a handful of group lists, each one is only expanded once below
+            group_lists[tuple(entry.food_groups)] += 1
+
+        # Foods left unresolved are counted apart instead of failing the summary
+        if isinstance(entry.hunger, (int, float)):
+            total_food_points += entry.hunger
+            hunger_values.append(entry.hunger)
+        if isinstance(entry.saturation, (int, float)):
+            qualities[bisect.bisect_right(thresholds, entry.saturation)] += 1
+        if not entry.hunger_resolved or not entry.saturation_resolved:
+            unresolved += 1
+
+    food_groups = Counter()
+    for group_list, count in group_lists.items():
+        for group in set(group_list) - {'None'}:
+            food_groups[group] += count
+
+    hunger_values.sort()
+    return {
+        'entries': count_entries(groups),
+        'foods': len(groups.get('foods', [])),
+        'unresolved_foods': unresolved,
+        'total_food_points': total_food_points,
+        'quality_thresholds': list(thresholds),
+        'qualities': qualities,
+        'food_groups': dict(sorted(food_groups.items())),
+        'mods': dict(sorted(mods.items())),
+        'hunger': {
+            'min': hunger_values[0] if hunger_values else None,
+            'max': hunger_values[-1] if hunger_values else None,
+            'mean': total_food_points / len(hunger_values) if hunger_values else None,
+            **{f'p{percentile}': get_percentile(hunger_values, percentile) for percentile in percentiles},
+        },
+    }
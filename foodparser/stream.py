@@ -0,0 +1,100 @@
+import json
+import sys
+
+from .entry import intern_value
+
+chunk_size = 1 << 16
+
+
+def intern_pairs(pairs):
+    return {sys.intern(key): intern_value(value) for key, value in pairs}
+
+
+class StreamReader:
+    # Decodes a Raw_FoodValues.json one entry at a time, only the entry being decoded is kept as text.
+    # Entries are passed to [read_entry] as soon as they are decoded when it is given
+
+    def __init__(self, file, size=chunk_size, read_entry=None):
+        self.file = file
+        self.read_entry = read_entry
+        self.size = size
+        self.buffer = ''
+        self.position = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder(object_pairs_hook=intern_pairs)
+
+    def read(self):
+        # Drops the text decoded so far and appends the next chunk, returns False at the end of the file
+        chunk = self.file.read(self.size)
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        self.eof = not chunk
+        return not self.eof
+
+    def peek(self):
+        # Next non-whitespace character, without consuming it
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in ' \t\n\r':
+                self.position += 1
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self.read():
+                raise ValueError('Unexpected end of file')
+
+    def expect(self, characters):
+        character = self.peek()
+        if character not in characters:
+            raise ValueError(f'Expected {" or ".join(repr(c) for c in characters)} but found {character!r} at offset {self.position}')
+        self.position += 1
+        return character
+
+    def decode(self):
+        # A value may only be complete once the next chunk confirms nothing follows it, e.g. numbers
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+                if end < len(self.buffer) or self.eof:
+                    self.position = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.read()
+
+    def iter_groups(self):
+        # Yields (group name, value) for every top-level field, lists are decoded one entry at a time
+        self.expect('{')
+        if self.peek() == '}':
+            self.position += 1
+            return
+
+        while True:
+            group_name = self.decode()
+            self.expect(':')
+
+            if self.peek() == '[':
+                self.position += 1
+                yield sys.intern(group_name), list(self.iter_list())
+            else:
+                yield sys.intern(group_name), self.decode()
+
+            if self.expect(',}') == '}':
+                return
+
+    def iter_list(self):
+        if self.peek() == ']':
+            self.position += 1
+            return
+
+        while True:
+            entry = self.decode()
+            yield entry if self.read_entry is None else self.read_entry(entry)
+            if self.expect(',]') == ']':
+                return
+
+
+def load_stream(file, size=chunk_size, read_entry=None):
+    # Same result as json.load() for a Raw_FoodValues.json, without holding the whole file in memory.
+    # With read_entry=Entry, the same result as entry.read_entries(json.load()) without ever holding every entry as a dict
+    return dict(StreamReader(file, size, read_entry).iter_groups())
@@ -0,0 +1,148 @@
+import argparse
+import csv
+import hashlib
+import io
+import itertools
+import json
+import os
+import sys
+
+from timeit import default_timer as timer
+
+from .config import Config, load_config
+from .entry import read_entries
+from .logs import log_file, log_level, setup_logging
+from .output import write_output
+from .parser import FoodParser
+from .statistics import get_quality_name
+
+# Compares the results of many configs on one pack, e.g. sweep.json:
+# {"base_saturation": [0.1, 0.2, 0.3], "bonus_smelting": [1, 2]}
+# runs the 6 combinations of those values. A list of settings, e.g. [{"base_saturation": 0.1}, {"bonus_smelting": 1}],
+# runs each of them instead. Settings which are lists themselves are given as lists of lists in the first form.
+
+cache_title = 'sweep-cache.json'
+
+
+def get_sweep_configs(sweep, config=None):
+    # (settings, config) pairs, every config being [config] with the settings changed
+    config = config or Config()
+    if isinstance(sweep, dict):
+        for name, values in sweep.items():
+            if not isinstance(values, list):
+                raise ValueError(f'Setting "{name}" must be given a list of values to sweep')
+        sweep = [dict(zip(sweep, values)) for values in itertools.product(*sweep.values())]
+
+    return [(settings, config.replace(settings)) for settings in sweep]
+
+
+def summarize(result):
+    statistics = result.get_statistics()
+    return {'total_food_points': statistics['total_food_points'], 'qualities': statistics['qualities']}
+
+
+def sweep_configs(groups, configs, batch=False, cache=None):
+    # Summary of the results of every config. The dependency graph is built once, only the values are recomputed for
+    # each config, from a copy of the entries as they were read. [cache] holds the summaries by config hash
+    cache = {} if cache is None else cache
+    graph = None
+    raw = None
+    summaries = []
+
+    for config in configs:
+        key = config.get_hash()
+        if key not in cache:
+            parser = FoodParser(config, batch)
+            if graph is None:
+                graph = parser.build_graph(groups)
+                raw = [entry.to_dict() for entry in graph['entries']]
+            elif raw is not None:
+                for entry, values in zip(graph['entries'], raw):
+                    entry.update(values)
+                graph['conversion_cycles'].clear()
+
+            try:
+                parser.check_problems(graph)
+            except ValueError as e:
+                cache[key] = {'error': str(e).splitlines()[0]}
+            else:
+                cache[key] = summarize(parser.resolve_values(groups, graph))
+
+        summaries.append(cache[key])
+
+    return summaries
+
+
+def get_table(configs, summaries):
+    # Comparison table of the configs as CSV, one row per config
+    qualities = max((len(summary.get('qualities', ())) for summary in summaries), default=0)
+    header = ['settings', 'config', 'quality_thresholds', 'total_food_points']
+    header += [get_quality_name(index) for index in range(qualities)]
+
+    output = io.StringIO()
+    writer = csv.writer(output, lineterminator='\n')
+    writer.writerow(header + ['error'])
+    for (settings, config), summary in zip(configs, summaries):
+        row = [json.dumps(settings), config.get_hash()[:8], json.dumps(config.quality_thresholds)]
+        if 'error' in summary:
+            row += [''] * (qualities + 1) + [summary['error']]
+        else:
+            row += [summary['total_food_points']] + summary['qualities'] + [''] * (qualities - len(summary['qualities'])) + ['']
+        writer.writerow(row)
+
+    return output.getvalue()
+
+
+def load_cache(output_root, input_hash):
+    # Summaries of an earlier sweep of the same input
+    try:
+        with open(os.path.join(output_root, cache_title), 'r') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    return cache['results'] if cache.get('input') == input_hash else {}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compares the totals and food qualities of many configs on one pack.')
+    parser.add_argument('sweep', help='JSON file of the settings to sweep, see the top of sweep.py')
+    parser.add_argument('--input', default='Raw_FoodValues.json', help='raw food values (default: Raw_FoodValues.json)')
+    parser.add_argument('--config', help='JSON file of the settings every config starts from')
+    parser.add_argument('--output', default='./output', help='folder the comparison table sweep.csv is written to (default: ./output)')
+    parser.add_argument('--batch', action='store_true', help='compute hunger and saturation values with NumPy')
+    parser.add_argument('--log-level', default=log_level, choices=['DEBUG', 'INFO', 'WARNING', 'ERROR', 'OFF'],
+                        help=f'minimum level written to the log (default: {log_level})')
+    parser.add_argument('--log-file', default=log_file, help=f'log file, overwritten on every run (default: {log_file})')
+    arguments = parser.parse_args(argv)
+
+    start = timer()
+    setup_logging(arguments.log_level, arguments.log_file)
+
+    with open(arguments.sweep, 'r') as f:
+        configs = get_sweep_configs(json.load(f), load_config(arguments.config) if arguments.config else None)
+    with open(arguments.input, 'rb') as f:
+        content = f.read()
+
+    # Results are kept by config hash, sweeping the same input again only runs the new configs
+    input_hash = hashlib.sha1(content).hexdigest()
+    cache = load_cache(arguments.output, input_hash)
+    summaries = sweep_configs(read_entries(json.loads(content)), [config for settings, config in configs], arguments.batch, cache)
+
+    os.makedirs(arguments.output, exist_ok=True)
+    directory = os.path.join(arguments.output, '')
+    table = get_table(configs, summaries)
+    write_output(directory, 'sweep.csv', table)
+    write_output(directory, cache_title, json.dumps({'input': input_hash, 'results': cache}, indent=4))
+
+    rows = list(csv.reader(io.StringIO(table)))
+    widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+    for row in rows:
+        print('  '.join(value.ljust(width) for value, width in zip(row, widths)).rstrip())
+
+    print(f'Compared {len(configs)} configs in {round(timer() - start, 3)} seconds')
+    return 1 if any('error' in summary for summary in summaries) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
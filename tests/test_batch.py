@@ -0,0 +1,34 @@
+import subprocess
+import sys
+
+from foodparser import Config, FoodParser
+
+
+def test_numpy_is_only_imported_by_the_batch_engine():
+    code = 'import sys, foodparser; foodparser.FoodParser(); assert "numpy" not in sys.modules'
+    subprocess.run([sys.executable, '-c', code], check=True)
+
+
+pack = {
+    'foods': [
+        {'name': 'm:stew', 'meta': 0, 'hunger': ['m:meat', 'm:carrot'], 'saturationModifier': ['m:meat', 'm:carrot'], 'type': 'Bowl'},
+        {'name': 'm:pie', 'meta': 0, 'hunger': ['m:stew', 'm:wheat', 'm:wheat'], 'appendGroups': ['Sweets'], 'removeGroups': ['Meats']},
+        {'name': 'm:ingot', 'meta': 0, 'hunger': ['m:ore'], 'type': 'smelting'},
+        {'name': 'm:cake', 'meta': 0, 'hunger': ['m:pie', 'm:sugar'], 'foodGroups': ['m:pie', 'Sweets']},
+        {'name': 'm:loop', 'meta': 0, 'hunger': ['m:knot', 'm:wheat']},
+        {'name': 'm:knot', 'meta': 0, 'hunger': ['m:loop']},
+    ],
+    'ingredients': [
+        {'name': 'm:meat', 'meta': 0, 'hunger': 3, 'saturationModifier': 0.8, 'foodGroups': ['Meats']},
+        {'name': 'm:carrot', 'meta': 0, 'hunger': 1, 'saturationModifier': 1, 'foodGroups': ['Vegetables']},
+        {'name': 'm:wheat', 'meta': 0, 'hunger': 1, 'saturationModifier': 0.4, 'foodGroups': ['Grains']},
+        {'name': 'm:wheat', 'meta': 1, 'hunger': 2},
+        {'name': 'm:ore', 'meta': 0, 'hunger': 0, 'saturationModifier': 0.0},
+    ],
+}
+
+
+def test_batch_engine_matches_python_engine():
+    config = Config(unresolved_ingredient={'hunger': 0, 'saturationModifier': 0.2, 'foodGroups': []})
+    expected = FoodParser(config).parse(pack).data
+    assert repr(FoodParser(config, batch=True).parse(pack).data) == repr(expected)
@@ -0,0 +1,29 @@
+import pytest
+
+from foodparser import Config, FoodParser
+from foodparser.cache import ValueCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ValueCache(str(tmp_path / 'cache.db'))
+    yield cache
+    cache.close()
+
+
+@pytest.mark.parametrize('incremental', [False, True])
+def test_cached_entry_keeps_its_field_order(cache, incremental):
+    FoodParser(Config(), cache=cache).parse({'foods': [
+        {'name': 'm:a', 'meta': 0, 'hunger': 2, 'saturationModifier': 0.5, 'foodGroups': ['Meats']},
+    ]}, incremental=incremental)
+    data = FoodParser(Config(), cache=cache).parse({'foods': [
+        {'foodGroups': ['Meats'], 'saturationModifier': 0.5, 'hunger': 2, 'meta': 0, 'name': 'm:a'},
+    ]}, incremental=incremental).data
+    assert list(data['foods'][0]) == ['foodGroups', 'saturationModifier', 'hunger', 'meta', 'name']
+
+
+def test_invalidate_matches_names_exactly(cache):
+    cache.put_many([(str(key), name, {}) for key, name in enumerate(['m:a_b', 'm:aXb', 'M:A_B', 'mod:x', 'Mod:y', 'mod:z'])])
+    assert cache.invalidate(['m:a_b']) == 1
+    assert cache.invalidate(['mod:']) == 2
+    assert sorted(name for name, in cache.connection.execute('SELECT name FROM entries')) == ['M:A_B', 'Mod:y', 'm:aXb']
@@ -0,0 +1,16 @@
+import pytest
+
+from foodparser import Config
+
+
+def test_unresolved_ingredient_needs_every_field():
+    with pytest.raises(ValueError, match='unresolved_ingredient'):
+        Config().replace({'unresolved_ingredient': {'hunger': 0}})
+    with pytest.raises(ValueError, match='unresolved_ingredient'):
+        Config().replace({'unresolved_ingredient': {'hunger': 0, 'saturationModifier': 0.2, 'foodGroups': [], 'meta': 0}})
+
+
+def test_unresolved_ingredient_accepts_stand_in_values():
+    values = {'hunger': 0, 'saturationModifier': 0.2, 'foodGroups': []}
+    assert Config().replace({'unresolved_ingredient': values}).unresolved_ingredient == values
+    assert Config().replace({'unresolved_ingredient': None}).unresolved_ingredient is None
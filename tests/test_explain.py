@@ -0,0 +1,27 @@
+import json
+
+from foodparser.explain import main
+
+
+def write_pack(tmp_path, entries):
+    path = tmp_path / 'Raw_FoodValues.json'
+    path.write_text(json.dumps({'foods': entries}))
+    return str(path)
+
+
+def test_explain_prints_derivation(tmp_path, capsys):
+    path = write_pack(tmp_path, [
+        {'name': 'm:a', 'meta': 0, 'hunger': ['m:b', 'm:b']},
+        {'name': 'm:b', 'meta': 0, 'hunger': 2, 'saturationModifier': 0.5, 'foodGroups': ['Meats']},
+    ])
+    assert main(['m:a', '--input', path]) == 0
+    assert 'hunger 4: 2 (m:b:0) + 2 (m:b:0)' in capsys.readouterr().out
+
+
+def test_explain_lists_unresolvable_ingredients(tmp_path, capsys):
+    path = write_pack(tmp_path, [
+        {'name': 'm:a', 'meta': 0, 'hunger': ['m:b', 'm:missing']},
+        {'name': 'm:b', 'meta': 0, 'hunger': 2, 'saturationModifier': 0.5, 'foodGroups': ['Meats']},
+    ])
+    assert main(['m:a', '--input', path]) == 1
+    assert 'Missing ingredient "m:missing:0" in "m:a:0"' in capsys.readouterr().out
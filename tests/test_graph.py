@@ -0,0 +1,118 @@
+import pytest
+
+from foodparser import Config, FoodParser
+
+
+def resolve(entries):
+    return FoodParser(Config()).parse({'entries': entries}).data['entries']
+
+
+def test_meta_variant_made_from_its_own_base_item():
+    # "minecraft:golden_apple" also names golden_apple:1 itself, which was never used before it had a value
+    entries = resolve([
+        {'name': 'minecraft:golden_apple', 'meta': 0, 'hunger': 4, 'saturationModifier': 1.2},
+        {'name': 'minecraft:golden_apple', 'meta': 1, 'hunger': ['minecraft:golden_apple', 'minecraft:gold_block']},
+        {'name': 'minecraft:gold_block', 'meta': 0, 'hunger': 0, 'saturationModifier': 0.0},
+    ])
+    assert entries[1]['hunger'] == 4
+    assert entries[1]['saturationModifier'] == 1.8
+
+
+def test_meta_variant_made_through_another_entry():
+    # m:x:1 -> m:y -> "m:x" only loops through m:x:1 by name, m:y takes its value from m:x:0
+    entries = resolve([
+        {'name': 'm:x', 'meta': 0, 'hunger': 3, 'saturationModifier': 0.5},
+        {'name': 'm:x', 'meta': 1, 'hunger': ['m:y']},
+        {'name': 'm:y', 'meta': 0, 'hunger': ['m:x']},
+    ])
+    assert entries[1]['hunger'] == 3
+    assert entries[2]['hunger'] == 3
+
+
+def test_circular_recipe_is_reported():
+    with pytest.raises(ValueError, match='Circular recipe'):
+        resolve([
+            {'name': 'm:a', 'meta': 0, 'hunger': ['m:b']},
+            {'name': 'm:b', 'meta': 0, 'hunger': ['m:a']},
+        ])
+
+
+def test_saturation_uses_numerical_entry_of_duplicate_key():
+    # The first "m:x" is resolved before "m:w" is reached, see graph.replay_saturation_sources()
+    entries = resolve([
+        {'name': 'm:x', 'meta': 0, 'hunger': 1, 'saturationModifier': ['m:z']},
+        {'name': 'm:x', 'meta': 0, 'hunger': 1, 'saturationModifier': 0.8},
+        {'name': 'm:z', 'meta': 0, 'hunger': 1, 'saturationModifier': 2.0},
+        {'name': 'm:w', 'meta': 0, 'hunger': 1, 'saturationModifier': ['m:x']},
+    ])
+    assert entries[0]['saturationModifier'] == 2.6
+    assert entries[3]['saturationModifier'] == 1.4
+
+
+def test_saturation_uses_duplicate_key_numerical_first():
+    # The integer is only turned into a float once its entry is reached, after "m:r"
+    entries = resolve([
+        {'name': 'm:r', 'meta': 0, 'hunger': 2, 'saturationModifier': ['m:i1']},
+        {'name': 'm:i1', 'meta': 0, 'hunger': 1, 'saturationModifier': 1},
+        {'name': 'm:i1', 'meta': 0, 'hunger': 1, 'saturationModifier': 0.4},
+    ])
+    assert entries[0]['saturationModifier'] == 0.8
+
+
+def test_malformed_ingredient_is_reported():
+    with pytest.raises(ValueError, match='Malformed ingredient "typo" in "m:a:0"'):
+        resolve([
+            {'name': 'm:a', 'meta': 0, 'hunger': ['typo', 'm:b']},
+            {'name': 'm:b', 'meta': 0, 'hunger': 2, 'foodGroups': ['Meats']},
+        ])
+
+
+def test_malformed_ingredient_uses_stand_in_values():
+    config = Config().replace({'unresolved_ingredient': {'hunger': 1, 'saturationModifier': 0.2, 'foodGroups': ['Fruits']}})
+    entries = FoodParser(config).parse({'entries': [
+        {'name': 'm:a', 'meta': 0, 'hunger': ['typo', 'm:b']},
+        {'name': 'm:b', 'meta': 0, 'hunger': 2, 'foodGroups': ['Meats']},
+    ]}).data['entries']
+    assert entries[0]['hunger'] == 3
+    assert entries[0]['foodGroups'] == ['Fruits', 'Meats']
+
+
+def test_circular_recipe_is_reported_once():
+    with pytest.raises(ValueError) as error:
+        resolve([
+            {'name': 'm:a', 'meta': 0, 'hunger': ['m:b'], 'saturationModifier': ['m:b']},
+            {'name': 'm:b', 'meta': 0, 'hunger': ['m:a', 'm:a:0', 'm:a'], 'saturationModifier': ['m:a', 'm:a:0']},
+        ])
+    problems = [line for line in str(error.value).splitlines() if 'Circular recipe' in line]
+    assert len(problems) == 1
+    assert problems[0] == 'Circular recipe "m:a:0" -> "m:b:0" -> "m:a:0" (foodGroups, saturationModifier, hunger)'
+
+
+def test_hunger_ingredient_with_meta():
+    entries = resolve([
+        {'name': 'm:a', 'meta': 0, 'hunger': 1, 'saturationModifier': 0.5},
+        {'name': 'm:a', 'meta': 1, 'hunger': 3, 'saturationModifier': 0.5},
+        {'name': 'm:b', 'meta': 0, 'hunger': ['m:a:1']},
+    ])
+    assert entries[2]['hunger'] == 3
+
+
+def test_food_groups_of_an_entry_named_like_its_ingredient():
+    # The second m:a merges the groups of the first one, it was never registered before its own groups were replaced
+    entries = resolve([
+        {'name': 'm:a', 'meta': 0, 'hunger': 2, 'saturationModifier': 0.5, 'foodGroups': ['Meats']},
+        {'name': 'm:a', 'meta': 0, 'hunger': ['m:a', 'm:b']},
+        {'name': 'm:b', 'meta': 0, 'hunger': 1, 'saturationModifier': 0.5, 'foodGroups': ['Fruits']},
+    ])
+    assert entries[1]['foodGroups'] == ['Fruits', 'Meats']
+
+
+def test_food_groups_merged_as_written():
+    # m:b had only registered its groups as written when m:a was replaced, before appendGroups and removeGroups applied
+    entries = resolve([
+        {'name': 'm:a', 'meta': 0, 'hunger': ['m:b']},
+        {'name': 'm:b', 'meta': 0, 'hunger': 1, 'saturationModifier': 0.5, 'foodGroups': ['Meats'],
+         'appendGroups': ['Fruits'], 'removeGroups': ['Meats']},
+    ])
+    assert entries[0]['foodGroups'] == ['Meats']
+    assert entries[1]['foodGroups'] == ['Fruits']
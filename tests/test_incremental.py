@@ -0,0 +1,68 @@
+import copy
+
+import pytest
+
+from foodparser import Config, FoodParser
+
+
+def get_pack():
+    return {
+        'foods': [
+            {'name': 'm:stew', 'meta': 0, 'hunger': ['m:meat', 'm:carrot'], 'saturationModifier': ['m:meat', 'm:carrot']},
+            {'name': 'm:pie', 'meta': 0, 'hunger': ['m:stew', 'm:wheat']},
+        ],
+        'ingredients': [
+            {'name': 'm:meat', 'meta': 0, 'hunger': 3, 'saturationModifier': 0.8, 'foodGroups': ['Meats']},
+            {'name': 'm:carrot', 'meta': 0, 'hunger': 1, 'saturationModifier': 0.6, 'foodGroups': ['Vegetables']},
+            {'name': 'm:wheat', 'meta': 0, 'hunger': 1, 'saturationModifier': 0.4, 'foodGroups': ['Grains']},
+        ],
+    }
+
+
+@pytest.mark.parametrize('edit, reused', [
+    # Same shape, the graph is kept
+    (lambda pack: pack['ingredients'][0].update(hunger=5), 2),
+    (lambda pack: pack['ingredients'][2].update(saturationModifier=1), 3),
+    # New ingredient, the graph is rebuilt
+    (lambda pack: pack['foods'][1]['hunger'].append('m:meat'), 4),
+])
+def test_update_matches_a_full_run(edit, reused):
+    parser = FoodParser(Config())
+    previous = get_pack()
+    result = parser.parse(previous, incremental=True)
+
+    edited = copy.deepcopy(previous)
+    edit(edited)
+    updated = parser.update(result, previous, edited)
+    assert updated.data == parser.parse(edited).data
+    assert len(updated.graph['restored']) == reused
+
+
+def test_update_needs_the_same_entries():
+    parser = FoodParser(Config())
+    previous = get_pack()
+    result = parser.parse(previous, incremental=True)
+
+    edited = copy.deepcopy(previous)
+    edited['ingredients'].reverse()
+    assert parser.update(result, previous, edited) is None
+
+
+@pytest.mark.parametrize('edit', [
+    lambda pack: pack['ingredients'][1].update(hunger=4),
+    lambda pack: pack['ingredients'][0].update(foodGroups=['Meats', 'Proteins']),
+    lambda pack: pack['foods'][0].update(saturationModifier=0.3),
+    lambda pack: pack['foods'].pop(1),
+    lambda pack: pack['ingredients'].append({'name': 'm:stew', 'meta': 0, 'hunger': 9}),
+])
+def test_incremental_run_matches_a_fresh_run(edit):
+    parser = FoodParser(Config())
+    previous = get_pack()
+    state = parser.parse(previous, incremental=True).get_state()
+
+    edited = copy.deepcopy(previous)
+    edit(edited)
+    result = parser.parse(edited, incremental=True, state=state)
+    fresh = parser.parse(edited, incremental=True)
+    assert result.data == fresh.data
+    assert result.get_state() == fresh.get_state()
@@ -0,0 +1,46 @@
+import json
+
+import pytest
+
+from foodparser import Config, FoodParser
+from foodparser.output import Serializer, clean_data, export_food_groups, output_food_values
+
+
+pack = {
+    'foods': [
+        {'name': 'm:stew', 'meta': 0, 'hunger': ['m:meat', 'm:carrot'], 'type': 'Bowl', 'note': {'by': 'café', 'tags': [1, [2.5]]}},
+        {'name': 'm:pie', 'meta': 3, 'hunger': ['m:stew', 'm:carrot'], 'appendGroups': ['Sweets'], 'removeGroups': [], 'extra': None},
+    ],
+    'ingredients': [
+        {'name': 'm:meat', 'meta': 0, 'hunger': 3, 'saturationModifier': 0.8, 'foodGroups': ['Meats']},
+        {'name': 'm:carrot', 'hunger': -1, 'saturationModifier': 1e-7, 'foodGroups': ['Vegetables', 'Légumes'], 'raw': True},
+    ],
+    'empty': [],
+}
+
+
+def dump(value):
+    return json.dumps(value, indent=4)
+
+
+@pytest.mark.parametrize('raw', [
+    {},
+    {'name': 'm:a', 'list': [], 'nested': [[1, 2], {'a': []}], 'object': {}, 'text': '"é\n"'},
+    *(entry for entries in pack.values() for entry in entries),
+])
+def test_dumps_entry_matches_json_dump(raw):
+    assert Serializer('json').dumps_entry(raw) == dump(raw)
+
+
+def test_output_files_match_json_dump(tmp_path):
+    result = FoodParser(Config()).parse(pack)
+    output_food_values(result.groups, str(tmp_path), serializer=Serializer('json'))
+    export_food_groups(result.groups, str(tmp_path), serializer=Serializer('json'))
+
+    directory = tmp_path / 'HungerOverhaul'
+    assert (directory / 'DEBUG-Food Values.json').read_bytes() == dump(result.data).encode()
+    assert (directory / 'Food Values.json').read_bytes() == dump(clean_data(result.groups)).encode()
+
+    meats = json.loads((tmp_path / 'SpiceOfLife' / 'Meats.json').read_text())
+    assert (tmp_path / 'SpiceOfLife' / 'Meats.json').read_bytes() == dump(meats).encode()
+    assert meats['food']['items'] == ['m:stew', 'm:pie:3']
@@ -0,0 +1,57 @@
+import json
+
+from foodparser import Config, FoodParser
+from foodparser.output import output_food_values
+from foodparser.snapshot import Snapshot, output_snapshot
+
+
+pack = {
+    'foods': [
+        {'name': 'm:stew', 'meta': 0, 'hunger': ['m:meat', 'm:carrot'], 'foodGroups': ['Vegetables', 'Meats', 'Vegetables']},
+        {'name': 'm:pie', 'hunger': ['m:stew', 'm:wheat']},
+        {'name': 'm:pie', 'meta': 0, 'hunger': 2, 'saturationModifier': 0.5, 'foodGroups': ['Grains']},
+        {'name': 'm:pie', 'meta': 12, 'hunger': ['m:wheat']},
+        {'name': 'm:berry', 'meta': 0, 'foodGroups': ['Fruits']},
+        {'name': 'm:soup', 'meta': 0, 'hunger': ['m:stew', 'm:missing'], 'saturationModifier': 1},
+    ],
+    'ingredients': [
+        {'name': 'm:meat', 'meta': 0, 'hunger': 3, 'saturationModifier': 0.8, 'foodGroups': ['Meats']},
+        {'name': 'm:carrot', 'meta': 0, 'hunger': 1, 'saturationModifier': 0.6, 'foodGroups': ['Vegetables']},
+        {'name': 'm:wheat', 'meta': 0, 'hunger': 1, 'saturationModifier': 0.4, 'foodGroups': ['Grains']},
+    ],
+}
+
+
+def test_snapshot_matches_debug_dump(tmp_path):
+    config = Config(unresolved_ingredient={'hunger': 0, 'saturationModifier': 0.2, 'foodGroups': []})
+    result = FoodParser(config).parse(pack)
+    output_food_values(result.groups, str(tmp_path))
+    output_snapshot(result.groups, str(tmp_path))
+
+    directory = tmp_path / 'HungerOverhaul'
+    foods = json.loads((directory / 'DEBUG-Food Values.json').read_text())['foods']
+    expected = {}
+    for food in foods:
+        key = f'{food["name"]}:{food.get("meta", 0)}'
+        value = {'name': food['name'], 'meta': food.get('meta', 0)}
+        if type(food.get('hunger')) is int:
+            value['hunger'] = food['hunger']
+        if type(food.get('saturationModifier')) in (int, float):
+            value['saturationModifier'] = float(food['saturationModifier'])
+        value['foodGroups'] = sorted(set(food.get('foodGroups', [])))
+        expected.setdefault(key, []).append(value)
+
+    with Snapshot(str(directory / 'Food Values.bin')) as snapshot:
+        assert len(snapshot) == len(foods)
+        for key, values in expected.items():
+            assert snapshot.lookup(key) == values
+        assert snapshot.lookup('m:pie') == expected['m:pie:0']
+        assert snapshot.lookup('m:meat') == []
+
+        groups = sorted({group for food in foods for group in food.get('foodGroups', [])})
+        assert snapshot.group_names == groups
+        for group in groups:
+            assert snapshot.get_group(group) == sorted(
+                (key for key, values in expected.items() for value in values if group in value['foodGroups']),
+                key=str.encode)
+        assert snapshot.get_group('Sweets') == []
@@ -0,0 +1,13 @@
+from foodparser.statistics import get_quality_labels
+
+
+def test_quality_labels_follow_thresholds():
+    assert get_quality_labels([0.6, 1.2, 1.8, 2.4]) == [
+        'Poor Foods (<0.6)', 'Low Foods (<1.2)', 'Normal Foods (<1.8)', 'Good Foods (<2.4)', 'Great Foods (+2.4)'
+    ]
+
+
+def test_quality_labels_cover_every_bucket():
+    labels = get_quality_labels([0.3, 0.6, 1.2, 1.8, 2.4, 3.0])
+    assert len(labels) == 7
+    assert labels[5:] == ['Quality 5 Foods (<3.0)', 'Quality 6 Foods (+3.0)']
@@ -0,0 +1,41 @@
+import io
+import json
+
+import pytest
+
+from foodparser.entry import Entry, read_entries
+from foodparser.stream import load_stream
+
+
+pack = {
+    'version': 2,
+    'foods': [
+        {'name': 'm:stew', 'meta': 0, 'hunger': ['m:meat', 'm:carrot'], 'saturationModifier': 1.25e-1, 'type': 'Bowl'},
+        {'name': 'm:pie', 'hunger': ['m:stew', 'm:wheat'], 'appendGroups': ['Grains'], 'note': {'by': 'café "x"'}},
+    ],
+    'ingredients': [
+        {'name': 'm:meat', 'meta': 12, 'hunger': 3, 'saturationModifier': 0.8, 'foodGroups': ['Meats']},
+        {'saturationModifier': 1, 'hunger': -10, 'name': 'm:carrot', 'foodGroups': []},
+    ],
+    'empty': [],
+}
+
+
+@pytest.mark.parametrize('size', [1, 7])
+def test_stream_matches_json_load(size):
+    text = json.dumps(pack, indent=4)
+    assert load_stream(io.StringIO(text), size) == json.load(io.StringIO(text))
+
+
+@pytest.mark.parametrize('size', [1, 7])
+def test_stream_entries_match_read_entries(size):
+    text = json.dumps(pack, indent=4)
+    streamed = load_stream(io.StringIO(text), size, read_entry=Entry)
+    loaded = json.load(io.StringIO(text))
+    expected = read_entries({group_name: entries for group_name, entries in loaded.items() if isinstance(entries, list)})
+
+    assert list(streamed) == list(loaded)
+    assert streamed['version'] == loaded['version']
+    for group_name, entries in expected.items():
+        assert [(entry.key, repr(entry.to_dict())) for entry in streamed[group_name]] == \
+               [(entry.key, repr(entry.to_dict())) for entry in entries]